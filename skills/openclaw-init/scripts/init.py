@@ -6,16 +6,13 @@ Interactive setup script for OpenClaw projects.
 Reads/writes .openclaw/state.json and generates CLAUDE.md.
 """
 
-import argparse
-import json
 import os
 import re
 import sys
-from datetime import datetime
 from pathlib import Path
 
-STATE_DIR = ".openclaw"
-STATE_FILE = STATE_DIR + "/state.json"
+import stages
+from state_store import STATE_DIR, StateError, StateStore
 
 def normalize_name(raw):
     """Convert project name to kebab-case."""
@@ -24,27 +21,6 @@ def normalize_name(raw):
     name = re.sub(r"-+", "-", name).strip("-")
     return name
 
-def ensure_dir(p):
-    Path(p).mkdir(parents=True, exist_ok=True)
-
-def write_file(p, content):
-    Path(p).write_text(content)
-
-def load_state(root):
-    sp = Path(root) / STATE_FILE
-    if sp.exists():
-        try:
-            return json.loads(sp.read_text())
-        except Exception as e:
-            return None
-    return None
-
-def save_state(root, state):
-    sd = Path(root) / STATE_DIR
-    ensure_dir(sd)
-    sp = sd / "state.json"
-    sp.write_text(json.dumps(state, indent=2, ensure_ascii=False))
-
 def get_input(prompt, default=None, validator=None):
     while True:
         if default:
@@ -92,6 +68,93 @@ def get_choice(prompt, options, default=None):
                 return o
         print(f"无效，请输入 1-{len(options)} 或选项名称")
 
+MODULE_DEFAULTS = {"skill": False, "plugin": False, "web": False, "oauth": False, "database": "none"}
+
+def new_state(project, config=None, modules=None):
+    """Build the initial state; missing fields take the interactive defaults.
+
+    The stage is not set: callers mark it with stages.complete(state, "init").
+    """
+    name = normalize_name(project.get("name", ""))
+    if not name:
+        raise ValueError("项目名称不能为空")
+    config = config or {}
+    return {
+        "version": "1.0",
+        "project": {
+            "name": name,
+            "description": project.get("description") or f"OpenClaw project: {name}",
+            "author": project.get("author") or os.getenv("USER", "developer"),
+        },
+        "config": {
+            "gateway_url": config.get("gateway_url") or None,
+            "gateway_token": config.get("gateway_token") or None,
+        },
+        "modules": dict(MODULE_DEFAULTS, **(modules or {})),
+        "docs": {},
+    }
+
+def write_claude_md(root, state):
+    proj = state["project"]
+    mods = state["modules"]
+    gw = state["config"]
+
+    md = f"""# OpenClaw 集成项目
+
+## 应用信息
+
+- **项目名称**: {proj.get('name', '-')}
+- **描述**: {proj.get('description', '-')}
+- **作者**: {proj.get('author', '-')}
+- **阶段**: {state.get('stage') or stages.INIT}
+
+## OpenClaw 文档
+
+开发时请参考官方文档：
+
+| 文档 | 链接 |
+|------|------|
+| 快速入门 | [docs.openclaw.ai](https://docs.openclaw.ai) |
+| API 参考 | [API Reference](https://docs.openclaw.ai/api) |
+| GitHub 仓库 | [openclaw/openclaw](https://github.com/openclaw/openclaw) |
+
+## 已选模块
+
+| 模块 | 状态 |
+|------|------|
+| Skill | {'✅' if mods.get('skill') else '❌'} |
+| Plugin | {'✅' if mods.get('plugin') else '❌'} |
+| Web | {'✅' if mods.get('web') else '❌'} |
+| OAuth | {'✅' if mods.get('oauth') else '❌'} |
+| Database | {mods.get('database', 'none')} |
+
+## Gateway 配置
+
+- URL: {gw.get('gateway_url') or '未配置'}
+- Token: {'已设置' if gw.get('gateway_token') else '未设置'}
+
+## 下一步
+
+- 运行 `/openclaw-prd` 定义产品需求（推荐）
+- 运行 `/openclaw-nextjs --quick` 快速生成项目（如果选择了 web 模块）
+- 或运行 `/openclaw-generator` 一站式生成
+
+> 注意：`.openclaw/state.json` 包含敏感信息，请勿提交到版本控制。
+"""
+    claude_path = Path(root) / "CLAUDE.md"
+    claude_path.write_text(md.strip() + "\n")
+
+def ensure_gitignore(root):
+    """Add the state dir to an existing .gitignore. Returns True if it was added."""
+    gitignore = Path(root) / ".gitignore"
+    if not gitignore.exists():
+        return False
+    if STATE_DIR in gitignore.read_text():
+        return False
+    with open(gitignore, "a") as f:
+        f.write(f"\n{STATE_DIR}/\n")
+    return True
+
 def check_clean(root):
     p = Path(root)
     if not p.exists():
@@ -104,6 +167,8 @@ def check_clean(root):
     return False, f"目录包含 {len(non_ignore)} 个文件/文件夹: " + ", ".join(i.name for i in non_ignore[:5])
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="OpenClaw Project Initializer")
     parser.add_argument("--output", default=os.getcwd())
     args = parser.parse_args()
@@ -120,7 +185,12 @@ def main():
             return
 
     # 检查已有配置
-    state = load_state(root)
+    store = StateStore(root)
+    try:
+        state = store.load()
+    except StateError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     if state:
         proj = state.get("project", {})
         print(f"\n发现已有配置:")
@@ -130,40 +200,31 @@ def main():
         if action == "取消":
             return
         if action == "重新初始化":
-            sd = Path(root) / STATE_DIR
-            if sd.exists():
-                import shutil
-                shutil.rmtree(sd)
+            store.reset()
             state = None
 
     # 如果没有配置，从头收集
     if not state:
-        state = {"version": "1.0", "stage": "init", "project": {}, "config": {}, "modules": {}, "docs": {}}
-
         # 项目信息
         print("\n=== 项目基本信息 ===")
         raw_name = get_input("项目名称（kebab-case）", validator=lambda x: re.match(r"^[a-z0-9-]+$", x))
         name = normalize_name(raw_name)
         if name != raw_name:
             print(f"  已规范化为: {name}")
-        state["project"]["name"] = name
-        state["project"]["description"] = get_input("项目描述", f"OpenClaw project: {name}")
-        state["project"]["author"] = get_input("作者（可选）", default=os.getenv("USER", "developer"))
+        project = {"name": name}
+        project["description"] = get_input("项目描述", f"OpenClaw project: {name}")
+        project["author"] = get_input("作者（可选）", default=os.getenv("USER", "developer"))
 
         # Gateway 配置
         print("\n=== OpenClaw Gateway 配置 ===")
+        config = {}
         if get_bool("是否需要配置 OpenClaw Gateway 连接？", "no"):
-            gw_url = get_input("Gateway URL", "http://localhost:18789")
-            gw_token = get_input("Gateway Token（可选）", default="")
-            state["config"]["gateway_url"] = gw_url
-            state["config"]["gateway_token"] = gw_token if gw_token else None
-        else:
-            state["config"]["gateway_url"] = None
-            state["config"]["gateway_token"] = None
+            config["gateway_url"] = get_input("Gateway URL", "http://localhost:18789")
+            config["gateway_token"] = get_input("Gateway Token（可选）", default="")
 
         # 模块选择
         print("\n=== 功能模块选择 ===")
-        state["modules"] = {
+        modules = {
             "skill": get_bool("包含 Skill？"),
             "plugin": get_bool("包含 Plugin？"),
             "web": get_bool("包含 Web 应用？"),
@@ -172,72 +233,25 @@ def main():
         }
 
         # 保存状态
-        save_state(root, state)
+        started = stages.begin(None, stages.INIT)  # after the prompts: the stage time excludes typing
+        state = new_state(project, config, modules)
+        state = store.save(stages.complete(state, stages.INIT, started))
         print("  → 配置已保存到 .openclaw/state.json")
 
     # 生成 CLAUDE.md
     print("\n=== 生成 CLAUDE.md ===")
-    proj = state["project"]
-    mods = state["modules"]
-    gw = state["config"]
-
-    md = f"""# OpenClaw 集成项目
-
-## 应用信息
-
-- **项目名称**: {proj.get('name', '-')}
-- **描述**: {proj.get('description', '-')}
-- **作者**: {proj.get('author', '-')}
-- **阶段**: {state.get('stage')}
-
-## OpenClaw 文档
-
-开发时请参考官方文档：
-
-| 文档 | 链接 |
-|------|------|
-| 快速入门 | [docs.openclaw.ai](https://docs.openclaw.ai) |
-| API 参考 | [API Reference](https://docs.openclaw.ai/api) |
-| GitHub 仓库 | [openclaw/openclaw](https://github.com/openclaw/openclaw) |
-
-## 已选模块
-
-| 模块 | 状态 |
-|------|------|
-| Skill | {'✅' if mods.get('skill') else '❌'} |
-| Plugin | {'✅' if mods.get('plugin') else '❌'} |
-| Web | {'✅' if mods.get('web') else '❌'} |
-| OAuth | {'✅' if mods.get('oauth') else '❌'} |
-| Database | {mods.get('database', 'none')} |
-
-## Gateway 配置
-
-- URL: {gw.get('gateway_url') or '未配置'}
-- Token: {'已设置' if gw.get('gateway_token') else '未设置'}
-
-## 下一步
-
-- 运行 `/openclaw-prd` 定义产品需求（推荐）
-- 运行 `/openclaw-nextjs --quick` 快速生成项目（如果选择了 web 模块）
-- 或运行 `/openclaw-generator` 一站式生成
-
-> 注意：`.openclaw/state.json` 包含敏感信息，请勿提交到版本控制。
-"""
-    claude_path = Path(root) / "CLAUDE.md"
-    claude_path.write_text(md.strip() + "\n")
+    write_claude_md(root, state)
     print(f"  → 已生成/更新 CLAUDE.md")
 
     # 提示 .gitignore
-    gitignore = Path(root) / ".gitignore"
-    if gitignore.exists():
-        content = gitignore.read_text()
-        if STATE_DIR not in content:
-            with open(gitignore, "a") as f:
-                f.write(f"\n{STATE_DIR}/\n")
-            print(f"  → 已添加 {STATE_DIR}/ 到 .gitignore")
-    else:
+    if ensure_gitignore(root):
+        print(f"  → 已添加 {STATE_DIR}/ 到 .gitignore")
+    elif not (Path(root) / ".gitignore").exists():
         print(f"  → 建议将 {STATE_DIR}/ 加入 .gitignore")
 
+    proj = state["project"]
+    mods = state["modules"]
+
     # 完成
     print("\n✅ OpenClaw 项目配置已完成！")
     print(f"\n项目名称: {proj['name']}")
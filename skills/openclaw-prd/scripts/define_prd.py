@@ -4,29 +4,21 @@ OpenClaw PRD Definition
 
 Interactive session to define product requirements based on selected modules.
 Updates .openclaw/state.json with prd details.
+
+--answers FILE replays a JSON (or YAML, with PyYAML installed) answers file
+instead of asking: the answers are validated against the questions the
+interactive session would ask for the project's modules and merged in one
+locked write. With --batch DIR... the same answers are applied to many
+projects in parallel, one JSON result line per project.
 """
 
-import argparse
-import json
 import os
 import sys
+import time
 from pathlib import Path
 
-STATE_DIR = ".openclaw"
-STATE_FILE = STATE_DIR + "/state.json"
-
-def load_state(root):
-    sp = Path(root) / STATE_FILE
-    if not sp.exists():
-        return None
-    try:
-        return json.loads(sp.read_text())
-    except:
-        return None
-
-def save_state(root, state):
-    sp = Path(root) / STATE_FILE
-    sp.write_text(json.dumps(state, indent=2, ensure_ascii=False))
+import stages
+from state_store import StateError, StateStore
 
 def get_input(prompt, default=None):
     if default:
@@ -89,29 +81,240 @@ def show_capabilities(modules):
         print(f"  - 本地数据持久化（{modules['database']}）")
         print("  - 存储用户会话、设置、笔记等\n")
 
+CHOICES = {
+    "skill_trigger": ["消息命令", "定时任务", "事件监听"],
+    "plugin_type": ["channel", "tool", "gateway-method", "composite"],
+    "design_style": ["简约现代", "温馨可爱", "专业商务", "其他"],
+    "tech_stack": ["nextjs", "vite-react"],
+}
+
+# answer key -> (module that makes main() ask it, answer kind)
+QUESTIONS = {
+    "summary": (None, "text"),
+    "target_users": (None, "text"),
+    "features": (None, "list"),
+    "skill_trigger": ("skill", "choice"),
+    "plugin_type": ("plugin", "choice"),
+    "web_pages": ("web", "list"),
+    "web_save_history": ("web", "bool"),
+    "oauth_scopes": ("oauth", "list"),
+    "db_tables": ("database", "text"),
+    "design_style": (None, "choice"),
+    "design_style_other": (None, "text"),
+    "color_preference": (None, "text"),
+    "tech_stack": ("web", "choice"),
+}
+
+def module_enabled(modules, name):
+    if name == "database":
+        return modules.get("database") not in (None, "", "none")
+    return bool(modules.get(name))
+
+def validate_answers(modules, answers):
+    """Check answers against the questions asked for ``modules``.
+
+    Returns (errors, warnings); answers for modules that are not selected
+    are only warned about, since main() would never ask them.
+    """
+    errors, warnings = [], []
+    for key, value in answers.items():
+        if key not in QUESTIONS:
+            errors.append(f"未知字段: {key}")
+            continue
+        module, kind = QUESTIONS[key]
+        if module and not module_enabled(modules, module):
+            warnings.append(f"{key}: 未选择 {module} 模块，已忽略")
+            continue
+        if kind == "choice" and value not in CHOICES[key]:
+            errors.append(f"{key}: {value!r} 不在可选项 {CHOICES[key]} 中")
+        elif kind == "bool" and not isinstance(value, bool):
+            errors.append(f"{key}: 应为 true/false")
+        elif kind == "list" and not (isinstance(value, str) or (
+                isinstance(value, list) and all(isinstance(v, str) for v in value))):
+            errors.append(f"{key}: 应为字符串列表或逗号分隔的字符串")
+        elif kind == "text" and not isinstance(value, str):
+            errors.append(f"{key}: 应为字符串")
+    if answers.get("design_style_other") and answers.get("design_style", "其他") != "其他":
+        warnings.append("design_style_other: 仅在 design_style 为 其他 时使用")
+    return errors, warnings
+
+def load_answers(path):
+    """Read PRD answers from JSON or YAML; a top-level "prd" object is unwrapped."""
+    import json
+
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("读取 YAML 需要 PyYAML（pip install pyyaml），或改用 JSON")
+        answers = yaml.safe_load(text)
+    else:
+        answers = json.loads(text)
+    if isinstance(answers, dict) and isinstance(answers.get("prd"), dict):
+        answers = answers["prd"]
+    if not isinstance(answers, dict):
+        raise ValueError(f"{path}: 答案文件应为对象")
+    return answers
+
+def split_list(value):
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return list(value)
+
+def prd_from_answers(modules, answers, prd=None):
+    """Non-interactive counterpart of main(): fill the PRD from an answers dict.
+
+    Only the questions main() would ask for the selected modules are applied;
+    unanswered ones keep the existing value or the interactive default.
+    """
+    prd = dict(prd or {})
+    def answer(key, default):
+        return answers.get(key, prd.get(key, default))
+
+    prd["summary"] = answer("summary", "")
+    prd["target_users"] = answer("target_users", "")
+    features = split_list(answers["features"]) if "features" in answers else prd.get("features", [])
+    if features:
+        prd["features"] = features
+    if module_enabled(modules, "skill"):
+        prd["skill_trigger"] = answer("skill_trigger", "消息命令")
+    if module_enabled(modules, "plugin"):
+        prd["plugin_type"] = answer("plugin_type", "tool")
+    if module_enabled(modules, "web"):
+        prd["web_pages"] = split_list(answer("web_pages", "首页,聊天"))
+        prd["web_save_history"] = bool(answers.get("web_save_history", False))
+    if module_enabled(modules, "oauth"):
+        prd["oauth_scopes"] = split_list(answer("oauth_scopes", "头像,昵称"))
+    if module_enabled(modules, "database"):
+        prd["db_tables"] = answer("db_tables", "用户会话")
+    prd["design_style"] = answer("design_style", "简约现代")
+    if prd["design_style"] == "其他":
+        prd["design_style_other"] = answer("design_style_other", "")
+    if answers.get("color_preference"):
+        prd["color_preference"] = answers["color_preference"]
+    if module_enabled(modules, "web"):
+        prd["tech_stack"] = answer("tech_stack", "nextjs")
+    return prd
+
+def apply_answers(root, answers, reset=False):
+    """Validate ``answers`` and merge them into the project's PRD in one locked write.
+
+    Returns (state, warnings); raises ValueError on invalid answers and
+    StateError when the project has no state.
+    """
+    with StateStore(root).transaction() as state:
+        started = stages.begin(state, stages.PRD)
+        modules = state.get("modules", {})
+        errors, warnings = validate_answers(modules, answers)
+        if errors:
+            raise ValueError("; ".join(errors))
+        state["prd"] = prd_from_answers(modules, answers, None if reset else state.get("prd"))
+        stages.complete(state, stages.PRD, started)
+    return state, warnings
+
+def apply_one(root, answers, reset):
+    start = time.perf_counter()
+    result = {"path": str(root)}
+    try:
+        _, warnings = apply_answers(root, answers, reset)
+        result["ok"] = True
+        if warnings:
+            result["warnings"] = warnings
+    except (StateError, ValueError, OSError) as e:
+        result.update(ok=False, error=str(e))
+    result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+def run_batch(roots, answers, reset=False, jobs=None):
+    """Apply one answers template to many projects on a thread pool."""
+    import json
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(apply_one, Path(r).resolve(), answers, reset) for r in roots]
+        for future in as_completed(futures):
+            result = future.result()
+            failed += not result["ok"]
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    print(f"已更新 {len(roots) - failed}/{len(roots)} 个项目", file=sys.stderr)
+    return failed == 0
+
+def print_summary(prd, modules):
+    print("\n" + "="*50)
+    print("📋 产品需求摘要\n")
+    print(f"应用目标: {prd.get('summary', '')}")
+    print(f"目标用户: {prd.get('target_users', '')}\n")
+    print("核心功能:")
+    for f in prd.get("features", []):
+        print(f"  - {f}")
+    print(f"\n设计偏好: {prd.get('design_style')}")
+    if modules.get("web"):
+        print(f"技术栈: {prd.get('tech_stack', 'nextjs')}")
+    print("\n已保存到 .openclaw/state.json")
+    print("\n下一步：")
+    print("  - /openclaw-nextjs --quick 快速生成 Next.js 项目")
+    print("  - 或 /openclaw-generator 一站式生成")
+    print("="*50)
+
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="OpenClaw PRD Definition")
     parser.add_argument("--output", default=os.getcwd())
+    parser.add_argument("--answers", metavar="FILE", help="从 JSON/YAML 答案文件读取，不再交互提问")
+    parser.add_argument("--reset", action="store_true", help="与 --answers 一起使用：丢弃已有 PRD 而不是合并")
+    parser.add_argument("--batch", nargs="+", metavar="DIR", help="把 --answers 应用到多个项目目录")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="--batch 的并发线程数")
     args = parser.parse_args()
 
+    if args.batch and not args.answers:
+        parser.error("--batch 需要 --answers")
+    if args.answers:
+        try:
+            answers = load_answers(args.answers)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if args.batch:
+            sys.exit(0 if run_batch(args.batch, answers, args.reset, args.jobs) else 1)
+        try:
+            state, warnings = apply_answers(Path(args.output).resolve(), answers, args.reset)
+        except (StateError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        for w in warnings:
+            print(f"⚠️  {w}")
+        print_summary(state["prd"], state.get("modules", {}))
+        return
+
     root = Path(args.output).resolve()
-    state = load_state(root)
+    store = StateStore(root)
+    try:
+        state = store.load()
+    except StateError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
     if not state:
         print("❌ 未找到 .openclaw/state.json，请先运行 /openclaw-init 初始化项目配置。")
         sys.exit(1)
 
-    stage = state.get("stage", "init")
-    if stage == "prd" or stage == "ready":
-        print(f"当前阶段: {stage}")
+    try:
+        stages.check_transition(state, stages.PRD)
+        defined = stages.reached(state, stages.PRD)
+    except stages.StageError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if defined:
+        print(f"当前阶段: {state['stage']}")
         resp = get_choice("已有 PRD 定义，是否重新定义？", ["继续编辑", "重新开始", "退出"], "继续编辑")
         if resp == "退出":
             return
         if resp == "重新开始":
             state["prd"] = {}
-            state["stage"] = "init"
-    else:
-        state.setdefault("prd", {})
+    state.setdefault("prd", {})
 
     modules = state.get("modules", {})
     prd = state["prd"]
@@ -139,25 +342,25 @@ def main():
     # 根据模块针对性提问
     if modules.get("skill"):
         print("\n【Skill 模块设置】")
-        trigger = get_choice("触发方式", ["消息命令", "定时任务", "事件监听"], prd.get("skill_trigger", "消息命令"))
+        trigger = get_choice("触发方式", CHOICES["skill_trigger"], prd.get("skill_trigger", "消息命令"))
         prd["skill_trigger"] = trigger
 
     if modules.get("plugin"):
         print("\n【Plugin 模块设置】")
-        ptype = get_choice("插件类型", ["channel", "tool", "gateway-method", "composite"], prd.get("plugin_type", "tool"))
+        ptype = get_choice("插件类型", CHOICES["plugin_type"], prd.get("plugin_type", "tool"))
         prd["plugin_type"] = ptype
 
     if modules.get("web"):
         print("\n【Web 应用设置】")
-        pages = get_input("主要页面（逗号分隔，如：首页,聊天,个人中心）", prd.get("web_pages", "首页,聊天"))
-        prd["web_pages"] = [p.strip() for p in pages.split(",")]
+        pages = get_input("主要页面（逗号分隔，如：首页,聊天,个人中心）", ",".join(split_list(prd.get("web_pages", "首页,聊天"))))
+        prd["web_pages"] = split_list(pages)
         save_history = get_bool("是否保存用户会话历史？", "no")
         prd["web_save_history"] = save_history
 
     if modules.get("oauth"):
         print("\n【OAuth 设置】")
-        requested_scopes = get_input("需要的用户信息（如：头像,昵称,邮箱）", prd.get("oauth_scopes", "头像,昵称"))
-        prd["oauth_scopes"] = [s.strip() for s in requested_scopes.split(",")]
+        requested_scopes = get_input("需要的用户信息（如：头像,昵称,邮箱）", ",".join(split_list(prd.get("oauth_scopes", "头像,昵称"))))
+        prd["oauth_scopes"] = split_list(requested_scopes)
 
     if modules.get("database") and modules.get("database") != "none":
         print("\n【Database 设置】")
@@ -166,7 +369,7 @@ def main():
 
     # 第三轮：设计偏好
     print("\n=== 设计偏好 ===")
-    style = get_choice("界面风格", ["简约现代", "温馨可爱", "专业商务", "其他"], prd.get("design_style", "简约现代"))
+    style = get_choice("界面风格", CHOICES["design_style"], prd.get("design_style", "简约现代"))
     prd["design_style"] = style
     if style == "其他":
         other_style = get_input("请描述你的风格偏好", "")
@@ -177,30 +380,17 @@ def main():
 
     # 技术栈（如果 web 未选，则跳过）
     if modules.get("web"):
-        tech = get_choice("技术栈", ["nextjs", "vite-react"], prd.get("tech_stack", "nextjs"))
+        tech = get_choice("技术栈", CHOICES["tech_stack"], prd.get("tech_stack", "nextjs"))
         prd["tech_stack"] = tech
 
-    # 保存 PRD
-    state["prd"] = prd
-    state["stage"] = "prd"
-    save_state(root, state)
+    # 保存 PRD（只合并本阶段的字段，不覆盖其它阶段同时写入的内容）
+    started = stages.begin(state, stages.PRD)  # after the prompts: the stage time excludes typing
+    with store.transaction() as current:
+        current["prd"] = prd
+        stages.complete(current, stages.PRD, started)
 
     # 输出摘要
-    print("\n" + "="*50)
-    print("📋 产品需求摘要\n")
-    print(f"应用目标: {summary}")
-    print(f"目标用户: {target_users}\n")
-    print("核心功能:")
-    for f in features:
-        print(f"  - {f}")
-    print(f"\n设计偏好: {style}")
-    if modules.get("web"):
-        print(f"技术栈: {prd.get('tech_stack', 'nextjs')}")
-    print("\n已保存到 .openclaw/state.json")
-    print("\n下一步：")
-    print("  - /openclaw-nextjs --quick 快速生成 Next.js 项目")
-    print("  - 或 /openclaw-generator 一站式生成")
-    print("="*50)
+    print_summary(prd, modules)
 
 if __name__ == "__main__":
     main()
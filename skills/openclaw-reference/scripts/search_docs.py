@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Doc Search - 技能文档全文检索
+
+BM25-ranked search over every skill doc in a workspace: each SKILL.md and
+each references/*.md (such as the api_reference.md that skill projects
+are generated with). Documents are split into passages at their headings
+(the text before the first heading, e.g. frontmatter, is a passage too)
+and tokenized like show_reference.py: lowercase ASCII words and CJK
+bigrams.
+
+    python search_docs.py 流式 响应
+    python search_docs.py "gateway token" --root ~/.openclaw/workspace/skills -k 3
+    python search_docs.py plugin entry --json
+
+Term counts per passage are cached in the openclaw-skills cache directory
+(doc-search.json, see show_reference.StatCache), keyed by path and checked by mtime and size; a changed
+stat with the same content hash skips re-tokenizing. Only changed files
+are re-indexed on each query.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from show_reference import StatCache, bm25, parse_sections, tokenize
+
+SKILLS_DIR = Path(__file__).resolve().parents[2]
+DOC_INDEX_VERSION = 1
+SNIPPET_CHARS = 240
+SKIP_DIRS = {".git", ".openclaw", ".openclaw-app", "node_modules", "__pycache__",
+             ".next", "dist", ".venv"}
+
+doc_cache = StatCache("doc-search", DOC_INDEX_VERSION)
+
+
+def find_docs(roots):
+    """SKILL.md and references/*.md files under ``roots``, each once."""
+    seen = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            names = ["SKILL.md"] if "SKILL.md" in filenames else []
+            if os.path.basename(dirpath) == "references":
+                names += sorted(n for n in filenames if n.endswith(".md") and n != "SKILL.md")
+            for name in names:
+                path = Path(dirpath, name).resolve()
+                if path not in seen:
+                    seen.add(path)
+                    yield path
+
+
+def split_passages(data):
+    """One passage per heading (own text only), plus any text before the first."""
+    sections = parse_sections(data)
+    spans = []
+    first = sections[0][2] if sections else len(data)
+    if data[:first].strip():
+        spans.append(([], 0, first))
+    stack = []
+    for level, title, start, end in sections:
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, title))
+        spans.append(([t for _, t in stack], start, end))
+
+    passages = []
+    for heading, start, end in spans:
+        terms = tokenize(data[start:end].decode("utf-8", "replace"))
+        if not terms:
+            continue
+        tf = {}
+        for term in terms:
+            tf[term] = tf.get(term, 0) + 1
+        passages.append({"heading": heading, "line": data.count(b"\n", 0, start) + 1,
+                         "start": start, "end": end, "length": len(terms), "tf": tf})
+    return passages
+
+
+def index_doc(path):
+    """Return (passages, status) with status "cached", "unchanged" or "indexed"."""
+    st = path.stat()
+    hit = doc_cache.get(path, st)
+    if hit is not None:
+        return hit[1], "cached"
+    import hashlib
+
+    data = path.read_bytes()
+    digest = hashlib.sha1(data).hexdigest()
+    old = doc_cache.peek(path)
+    if old and old[0] == digest:
+        passages, status = old[1], "unchanged"
+    else:
+        passages, status = split_passages(data), "indexed"
+    doc_cache.put(path, st, [digest, passages])
+    return passages, status
+
+
+def build(roots):
+    """{path: passages} for every doc under ``roots``, plus per-status counts."""
+    docs, counts = {}, {"cached": 0, "unchanged": 0, "indexed": 0}
+    for path in find_docs(roots):
+        try:
+            docs[path], status = index_doc(path)
+        except OSError as e:
+            print(f"[WARN] {path}: {e}", file=sys.stderr)
+            continue
+        counts[status] += 1
+    doc_cache.save()
+    return docs, counts
+
+
+def search(docs, query, limit=5):
+    """Top ``limit`` (score, path, passage) by BM25 over all passages."""
+    terms = tokenize(query)
+    passages = [(path, p) for path, ps in docs.items() for p in ps]
+    postings = {}
+    for n, (_, p) in enumerate(passages):
+        for term in set(terms).intersection(p["tf"]):
+            postings.setdefault(term, {})[n] = p["tf"][term]
+    scores = bm25(terms, postings, {n: p["length"] for n, (_, p) in enumerate(passages)})
+    results = [(score, passages[n][0], passages[n][1]) for n, score in scores.items()]
+    results.sort(key=lambda r: (-r[0], str(r[1]), r[2]["start"]))
+    return results[:limit]
+
+
+def snippet(path, passage, query, width=SNIPPET_CHARS):
+    """The passage lines around its best-matching line, whitespace collapsed."""
+    with open(path, "rb") as f:
+        f.seek(passage["start"])
+        text = f.read(passage["end"] - passage["start"]).decode("utf-8", "replace")
+    lines = [l.strip() for l in text.splitlines()]
+    if passage["heading"]:
+        lines = lines[1:]
+    lines = [l for l in lines if l and l not in ("---", "```") and not l.startswith("```")]
+    if not lines:
+        return ""
+    terms = set(tokenize(query))
+    best = max(range(len(lines)), key=lambda i: (len(terms.intersection(tokenize(lines[i]))), -i))
+    out = lines[best]
+    for line in lines[best + 1:]:
+        if len(out) >= width:
+            break
+        out += " " + line
+    out = " ".join(out.split())
+    return out if len(out) <= width else out[:width - 1] + "…"
+
+
+def display_path(path):
+    try:
+        return path.relative_to(Path.cwd()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Search SKILL.md and references/*.md docs (BM25)")
+    parser.add_argument("query", nargs="+")
+    parser.add_argument("--root", action="append", metavar="DIR",
+                        help=f"directory to search, repeatable (default: {SKILLS_DIR})")
+    parser.add_argument("-k", "--limit", type=int, default=5, help="results to show (default 5)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    docs, counts = build([Path(r).resolve() for r in args.root or [SKILLS_DIR]])
+    query = " ".join(args.query)
+    results = search(docs, query, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    rows = [{"score": round(score, 3), "path": display_path(path), "line": p["line"],
+             "heading": " > ".join(p["heading"]), "snippet": snippet(path, p, query)}
+            for score, path, p in results]
+    if args.json:
+        import json
+        print(json.dumps({"query": query, "docs": len(docs), "results": rows},
+                         ensure_ascii=False, indent=2))
+    else:
+        for i, r in enumerate(rows, 1):
+            print(f"{i}. [{r['score']:.2f}] {r['path']}:{r['line']}  {r['heading'] or '(preamble)'}")
+            if r["snippet"]:
+                print(f"   {r['snippet']}")
+        if not rows:
+            print(f"No matches for '{query}'")
+    print(f"{len(docs)} docs ({counts['indexed']} indexed, {counts['unchanged']} rehashed, "
+          f"{counts['cached']} cached) in {elapsed:.1f}ms", file=sys.stderr)
+    if not rows:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,410 @@
 OpenClaw API Reference
 
 When invoked, displays the OpenClaw API reference documentation.
+
+    python show_reference.py                     # the whole SKILL.md
+    python show_reference.py chat completions    # only the matching sections
+    python show_reference.py --list              # section outline
+    python show_reference.py sse 流式 --budget 400  # best sections within ~400 tokens
+
+Queries go through a section index persisted next to SKILL.md
+(.SKILL.md.index.json): every heading with its level, heading path and
+byte span, plus an inverted index from terms to sections. A section runs
+until the next heading of the same or a higher level, so it includes its
+subsections; the level-1 document title covers only its introduction.
+Terms are lowercase ASCII words and CJK bigrams from the section's own
+text and the headings above it. A lookup picks the sections containing
+every query term (or, failing that, the most terms) and seeks straight to
+their bytes. The index is rebuilt whenever SKILL.md's mtime or size
+changes.
+
+--budget N ranks sections by BM25 against the query and greedily packs
+each section's own text, best first, skipping any that would overflow an
+estimated N tokens; without a query it prints the document from the top
+(frontmatter included) until the budget runs out. When not even the first
+section fits, as much of it as the budget allows is printed, cut at a line.
+The estimate is one token per non-ASCII character plus one per four ASCII
+characters, stored per section in the index. Sections that did not fit are
+listed in a closing HTML comment.
+
+Launched once per lookup, so it sticks to os.path and sys: pathlib alone
+costs more to import than reading and printing the document.
 """
 
+import os
 import sys
-from pathlib import Path
 
-SKILL_MD = Path(__file__).parent.parent / "SKILL.md"
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILL_MD = os.path.join(SKILL_DIR, "SKILL.md")
+INDEX_FILE = os.path.join(SKILL_DIR, ".SKILL.md.index.json")
+INDEX_VERSION = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+CACHE_MAX_ENTRIES = 20000
+
+
+def is_cjk(ch):
+    return "㐀" <= ch <= "鿿" or "豈" <= ch <= "﫿"
+
+
+def tokenize(text):
+    """Lowercase ASCII words plus CJK character bigrams (single chars for runs of one)."""
+    import re
+
+    terms = []
+    for run in re.findall(r"[a-z0-9_]+|[㐀-鿿豈-﫿]+", text.lower()):
+        if not is_cjk(run[0]):
+            terms.append(run)
+        elif len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def estimate_tokens(text):
+    """Approximate LLM tokens: one per non-ASCII character, one per 4 ASCII characters."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return len(text) - ascii_chars + (ascii_chars + 3) // 4
+
+
+def truncate(text, budget):
+    """The leading whole lines of ``text`` within ``budget`` tokens, or part of the first line.
+
+    A code fence left open by the cut is dropped with everything after it.
+    """
+    out, used = [], 0
+    for line in text.splitlines(True):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            if not out:
+                for ch in line:
+                    used += estimate_tokens(ch)
+                    if used > budget:
+                        break
+                    out.append(ch)
+            break
+        out.append(line)
+        used += cost
+    fences = [n for n, line in enumerate(out) if line.lstrip().startswith(("```", "~~~"))]
+    if len(fences) % 2:
+        out = out[:fences[-1]]
+    return "".join(out).rstrip()
+
+
+def bm25(terms, postings, lengths, k1=BM25_K1, b=BM25_B):
+    """{doc: score} for query ``terms``.
+
+    ``postings`` maps term -> {doc: term frequency}; ``lengths`` maps every
+    doc to its length in terms.
+    """
+    import math
+
+    if not lengths:
+        return {}
+    avgdl = sum(lengths.values()) / len(lengths)
+    scores = {}
+    for term in set(terms):
+        docs = postings.get(term)
+        if not docs:
+            continue
+        idf = math.log(1 + (len(lengths) - len(docs) + 0.5) / (len(docs) + 0.5))
+        for doc, tf in docs.items():
+            norm = k1 * (1 - b + b * lengths[doc] / avgdl)
+            scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+def parse_sections(data):
+    """[(level, title, start, body_end)] for each Markdown heading outside code fences.
+
+    ``body_end`` is where the section's own text stops (the next heading).
+    """
+    headings, offset, fenced = [], 0, False
+    for line in data.splitlines(True):
+        stripped = line.lstrip()
+        if stripped.startswith(b"```") or stripped.startswith(b"~~~"):
+            fenced = not fenced
+        elif not fenced and line.startswith(b"#"):
+            marks = len(line) - len(line.lstrip(b"#"))
+            title = line[marks:].strip()
+            if marks <= 6 and title and line[marks:marks + 1] in (b" ", b"\t"):
+                headings.append((marks, title.decode("utf-8", "replace"), offset))
+        offset += len(line)
+    return [(level, title, start, headings[i + 1][2] if i + 1 < len(headings) else len(data))
+            for i, (level, title, start) in enumerate(headings)]
+
+
+def build_index(data, st):
+    sections, terms, stack = [], {}, []
+    parsed = parse_sections(data)
+    for i, (level, title, start, body_end) in enumerate(parsed):
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, title))
+        end = body_end if level == 1 else next(
+            (s for lv, _, s, _ in parsed[i + 1:] if lv <= level), len(data))
+        path = [t for _, t in stack]
+        own = data[start:body_end].decode("utf-8", "replace")
+        context = " ".join(t for lv, t in stack[:-1] if lv > 1)
+        words = tokenize(context + "\n" + own)
+        sections.append({"title": title, "level": level, "path": path, "start": start, "end": end,
+                         "body_end": body_end, "length": len(words),
+                         "tokens": estimate_tokens(own.rstrip())})
+        tf = {}
+        for term in words:
+            tf[term] = tf.get(term, 0) + 1
+        for term, count in tf.items():
+            terms.setdefault(term, []).append([i, count])
+    preamble = data[:parsed[0][2] if parsed else len(data)].decode("utf-8", "replace").rstrip()
+    return {"version": INDEX_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "preamble_tokens": estimate_tokens(preamble), "sections": sections, "terms": terms}
+
+
+def load_index(path=SKILL_MD, index_file=INDEX_FILE):
+    """The section index for ``path``, rebuilt (and re-saved) when the file changed."""
+    import json
+
+    st = os.stat(path)
+    try:
+        with open(index_file, encoding="utf-8") as f:
+            index = json.load(f)
+        if (index.get("version") == INDEX_VERSION and index.get("mtime_ns") == st.st_mtime_ns
+                and index.get("size") == st.st_size):
+            return index
+    except (OSError, ValueError):
+        pass
+    with open(path, "rb") as f:
+        index = build_index(f.read(), st)
+    tmp = f"{index_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, index_file)
+    except OSError:  # read-only install: keep the in-memory index
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return index
+
+
+def cache_dir():
+    """$OPENCLAW_CACHE_DIR, or ~/.cache/openclaw-skills (the validate.py cache directory)."""
+    return os.environ.get("OPENCLAW_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "openclaw-skills")
+
+
+class StatCache:
+    """Values persisted in ``<cache_dir>/<name>.json``, keyed by path and valid
+    while the file's (mtime_ns, size) is unchanged. Concurrent processes merge
+    on save and never leave a partial file."""
+
+    def __init__(self, name, version):
+        self.path = os.path.join(cache_dir(), f"{name}.json")
+        self.version = version
+        self.entries = None
+        self.dirty = {}
+
+    def _load(self):
+        import json
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("entries", {}) if data.get("version") == self.version else {}
+
+    def _entry(self, path):
+        if self.entries is None:
+            self.entries = self._load()
+        return self.entries.get(str(path))
+
+    def get(self, path, st):
+        hit = self._entry(path)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        return None
+
+    def peek(self, path):
+        """Last stored value for ``path`` whether or not it is still fresh."""
+        hit = self._entry(path)
+        return hit[2] if hit else None
+
+    def put(self, path, st, value):
+        self._entry(path)
+        entry = [st.st_mtime_ns, st.st_size, value]
+        self.entries[str(path)] = self.dirty[str(path)] = entry
+
+    def save(self):
+        import json
+
+        if not self.dirty:
+            return
+        entries = self._load()
+        entries.update(self.dirty)
+        if len(entries) > CACHE_MAX_ENTRIES:
+            entries = dict(list(entries.items())[-CACHE_MAX_ENTRIES:])
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entries": entries}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # caching is best effort
+        self.dirty = {}
+
+
+def lookup(index, query):
+    """Indices of the sections matching ``query``, outermost first in document order.
+
+    Sections containing every query term win; otherwise those with the most.
+    A section nested in another selected one is dropped (its parent prints it).
+    """
+    wanted = set(tokenize(query))
+    if not wanted:
+        return []
+    hits = {}
+    for term in wanted:
+        for i, _ in index["terms"].get(term, ()):
+            hits[i] = hits.get(i, 0) + 1
+    if not hits:
+        return []
+    best = max(hits.values())
+    chosen, covered = [], -1
+    sections = index["sections"]
+    for i in sorted(i for i, n in hits.items() if n == best):
+        if sections[i]["start"] < covered:
+            continue
+        chosen.append(i)
+        covered = sections[i]["end"]
+    return chosen
+
+
+def rank(index, query):
+    """[(score, section index)] best first by BM25; every section, in order, without a query."""
+    sections = index["sections"]
+    terms = tokenize(query or "")
+    if not terms:
+        return [(0.0, i) for i in range(len(sections))]
+    postings = {t: dict(index["terms"][t]) for t in set(terms) if t in index["terms"]}
+    scores = bm25(terms, postings, {i: s["length"] for i, s in enumerate(sections)})
+    return sorted(((score, i) for i, score in scores.items()), key=lambda r: (-r[0], r[1]))
+
+
+def pack(index, ranked, budget, prefix=False):
+    """Greedily take ranked sections' own text within ``budget`` estimated tokens.
+
+    With ``prefix`` packing stops at the first section that does not fit.
+    Returns (chosen indices in document order, [(omitted index, tokens)], tokens used).
+    """
+    chosen, omitted, used = [], [], 0
+    for _, i in ranked:
+        tokens = index["sections"][i]["tokens"]
+        if used + tokens <= budget and not (prefix and omitted):
+            chosen.append(i)
+            used += tokens
+        else:
+            omitted.append((i, tokens))
+    return sorted(chosen), omitted, used
+
+
+def read_preamble(index, path=SKILL_MD):
+    """The text before the first heading (the frontmatter)."""
+    sections = index["sections"]
+    with open(path, "rb") as f:
+        data = f.read(sections[0]["start"]) if sections else f.read()
+    return data.decode("utf-8", "replace").rstrip()
+
+
+def read_section(section, path=SKILL_MD, own=False):
+    """The section's Markdown (``own``: without subsections), minus a trailing ``---`` rule."""
+    end = section["body_end"] if own else section["end"]
+    with open(path, "rb") as f:
+        f.seek(section["start"])
+        text = f.read(end - section["start"]).decode("utf-8", "replace").rstrip()
+    if text.endswith("\n---"):
+        text = text[:-4].rstrip()
+    return text
+
+
+def print_budgeted(index, query, budget):
+    sections = index["sections"]
+    ranked = rank(index, query)
+    if not ranked:
+        print(f"No reference section matches '{query}'.", file=sys.stderr)
+        sys.exit(1)
+    prefix = not tokenize(query)
+    head, used = [], 0
+    if prefix and index["preamble_tokens"]:
+        preamble = read_preamble(index)
+        if index["preamble_tokens"] > budget:
+            preamble = truncate(preamble, budget - 1) + "…"
+        head.append(preamble)
+        used = min(index["preamble_tokens"], budget)
+    chosen, omitted, packed = pack(index, ranked, budget - used, prefix)
+    used += packed
+    parts = head + [read_section(sections[i], own=True) for i in chosen]
+    cut = None
+    if omitted and (prefix or not chosen) and budget - used > 1:
+        # nothing (more) fits whole: print the start of the next section instead of nothing
+        i, tokens = omitted[0]
+        text = truncate(read_section(sections[i], own=True), budget - used - 1)
+        if text:
+            cut = sections[i]
+            parts.append(text + "…")
+            used += estimate_tokens(text) + 1
+            omitted = omitted[1:]
+    parts = [p for p in parts if p]
+    if omitted or cut:
+        name = lambda s: " > ".join(s["path"][1:]) or s["title"]
+        notes = [f"~{used}/{budget} tokens"]
+        if cut:
+            notes.append(f"truncated {name(cut)} ~{cut['tokens']}")
+        if omitted:
+            listed = ", ".join(f"{name(sections[i])} ~{t}" for i, t in omitted[:20])
+            more = f" (+{len(omitted) - 20} more)" if len(omitted) > 20 else ""
+            notes.append(f"omitted {len(omitted)} section(s): {listed}{more}")
+        parts.append(f"<!-- {'; '.join(notes)} -->")
+    print("\n\n".join(parts))
+
 
 def main():
-    if SKILL_MD.exists():
-        print(SKILL_MD.read_text())
-    else:
+    if not os.path.exists(SKILL_MD):
         print("OpenClaw API Reference\n\nNo reference content found.")
         sys.exit(1)
+    if len(sys.argv) == 1:
+        with open(SKILL_MD, encoding="utf-8") as f:
+            sys.stdout.write(f.read() + "\n")
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the OpenClaw API reference, or the sections matching a query")
+    parser.add_argument("query", nargs="*", help="keywords, e.g. 'chat completions' or 认证")
+    parser.add_argument("--list", action="store_true", help="print the section outline")
+    parser.add_argument("--budget", type=int, metavar="TOKENS",
+                        help="print the most relevant sections that fit in about TOKENS tokens")
+    args = parser.parse_args()
+
+    index = load_index()
+    if args.budget is not None:
+        print_budgeted(index, " ".join(args.query), args.budget)
+        return
+    if args.list or not args.query:
+        for section in index["sections"]:
+            print(f"{'  ' * (section['level'] - 1)}{section['title']}")
+        return
+    query = " ".join(args.query)
+    chosen = lookup(index, query)
+    if not chosen:
+        print(f"No reference section matches '{query}'. Sections:", file=sys.stderr)
+        for section in index["sections"]:
+            if section["level"] <= 3:
+                print(f"  {' > '.join(section['path'][1:]) or section['title']}", file=sys.stderr)
+        sys.exit(1)
+    print("\n\n".join(read_section(index["sections"][i]) for i in chosen))
+
 
 if __name__ == "__main__":
     main()
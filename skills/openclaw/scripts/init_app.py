@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 """
 OpenClaw App Generator - 一站式生成 OpenClaw 项目
+
+Batch mode (--batch specs.jsonl) generates many projects in one process:
+each line (or array item) is a project config, unspecified options take
+the --quick defaults, and one JSON result line is printed per project.
+
+Project files are rendered from templates/<type>/*.tmpl (see
+template_engine.py) and committed through project_writer.ProjectWriter: staged
+next to the target and renamed into place, skipping unchanged files.
 """
 
-import argparse
 import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
+
+from project_writer import ProjectWriter
+from state_store import StateError, StateStore
+from template_engine import project_templates, render_project
 
 ALLOWED_TYPES = {"skill", "plugin", "web"}
-STATE_FILE = ".openclaw-app/state.json"
+STATE_DIR = ".openclaw-app"
 
 
 def normalize(name):
@@ -23,35 +34,12 @@ def title_case(name):
     return " ".join(w.capitalize() for w in name.split("-"))
 
 
-def ensure_dir(p):
-    Path(p).mkdir(parents=True, exist_ok=True)
-
-
-def write_file(p, content):
-    Path(p).write_text(content)
-
-
 def load_state(out_dir):
-    sp = Path(out_dir) / STATE_FILE
-    if sp.exists():
-        try:
-            return json.loads(sp.read_text())
-        except:
-            return None
-    return None
+    return StateStore(out_dir, STATE_DIR).load()
 
 
 def save_state(out_dir, stage, ptype, config):
-    sd = Path(out_dir) / ".openclaw-app"
-    ensure_dir(sd)
-    sp = sd / "state.json"
-    state = {
-        "stage": stage,
-        "projectType": ptype,
-        "config": config,
-        "updatedAt": datetime.now().isoformat()
-    }
-    sp.write_text(json.dumps(state, indent=2))
+    StateStore(out_dir, STATE_DIR).save({"stage": stage, "projectType": ptype, "config": config})
 
 
 def check_clean(out_dir):
@@ -59,7 +47,7 @@ def check_clean(out_dir):
     if not p.exists():
         return True, "目录不存在，将创建"
     items = list(p.iterdir())
-    ignore = ['.git', '.openclaw-app', 'node_modules', '__pycache__', '.next']
+    ignore = ['.git', STATE_DIR, 'node_modules', '__pycache__', '.next']
     non_ignore = [i for i in items if i.name not in ignore and not i.name.startswith('.')]
     if not non_ignore:
         return True, "目录为空"
@@ -136,385 +124,178 @@ def web_config(quick):
     return {"use_oauth": use_oauth, "oauth_provider": oauth_provider, "use_database": use_database}
 
 
-def skill_template(config):
-    name = config["project_name"]
-    title = title_case(name)
-    desc = config.get("description", "A skill for OpenClaw")
-    files = {}
-    
-    files["SKILL.md"] = f"""---
-name: {name}
-description: {desc}
----
-
-# {title}
-
-## Overview
-
-[TODO: 填写技能概述]
-
-## Resources
-
-### scripts/
-Executable code (Python/Bash/etc.) that can be run directly.
-
-### references/
-Documentation and reference material.
-
-### assets/
-Files not intended to be loaded into context, but used in output.
-"""
-    
-    if config.get("create_scripts"):
-        files["scripts/example.py"] = f'''#!/usr/bin/env python3
-"""
-Example helper script for {name}
-"""
-
-def main():
-    print("Hello from skill: {name}!")
-
-if __name__ == "__main__":
-    main()
-'''
-    
-    if config.get("create_references"):
-        files["references/api_reference.md"] = f"""# API Reference for {title}
-
-Document API endpoints, data schemas, and usage examples.
-
-## When to Use
-
-- Detailed API documentation
-- Configuration options
-- Troubleshooting guides
-"""
-    
-    if config.get("create_assets"):
-        files["assets/README.md"] = "Place asset files (templates, images, etc.) here.\n"
-    
-    files["README.md"] = f"""# {title}
+SKILL_OPTIONAL_FILES = {
+    "scripts/example.py": "create_scripts",
+    "references/api_reference.md": "create_references",
+    "assets/README.md": "create_assets",
+}
 
-{desc}
 
-## Usage
+def template_context(config, default_desc):
+    name = config["project_name"]
+    return {
+        "name": name,
+        "title": title_case(name),
+        "description": config.get("description", default_desc),
+        "plugin_type": config.get("plugin_type", "tool"),
+    }
 
-1. Place this skill folder in your OpenClaw workspace `skills/` directory
-2. Restart OpenClaw Gateway
-3. The skill will be automatically loaded
 
-See `SKILL.md` for skill details.
-"""
-    return files
+def skill_template(config):
+    skip = [rel for rel, flag in SKILL_OPTIONAL_FILES.items() if not config.get(flag)]
+    return render_project("skill", template_context(config, "A skill for OpenClaw"), skip)
 
 
 def plugin_template(config):
-    name = config["project_name"]
-    title = title_case(name)
-    desc = config.get("description", "An OpenClaw plugin")
-    ptype = config.get("plugin_type", "tool")
-    
-    index_ts = f'''// {title}
-// {desc}
-
-import {{ OpenClawPluginApi }} from "openclaw/plugin-sdk";
-
-export default function register(api: OpenClawPluginApi) {{
-  console.log("{title} plugin loaded!");
-  
-  // Customize based on plugin type: {ptype}
-  // See OpenClaw plugin docs for registration patterns.
-}}
-'''
-    
-    package_json = {
-        "name": f"@openclaw/{name}",
-        "version": "1.0.0",
-        "description": desc,
-        "main": "dist/index.js",
-        "scripts": {"build": "tsc", "dev": "tsc --watch", "clean": "rm -rf dist"},
-        "keywords": ["openclaw", "plugin"],
-        "author": "Developer",
-        "license": "MIT",
-        "openclaw": {
-            "extensions": ["./dist/index.js"],
-            "plugin": {"id": name, "name": title, "description": desc}
-        },
-        "peerDependencies": {"openclaw": ">=2026.2.0"},
-        "devDependencies": {"typescript": "^5.0.0", "@types/node": "^20"}
-    }
-    
-    tsconfig = {
-        "compilerOptions": {
-            "target": "ES2020",
-            "module": "commonjs",
-            "lib": ["ES2020"],
-            "outDir": "./dist",
-            "rootDir": "./",
-            "strict": True,
-            "esModuleInterop": True,
-            "skipLibCheck": True,
-            "forceConsistentCasingInFileNames": True,
-            "declaration": True,
-            "declarationMap": True,
-            "sourceMap": True,
-            "resolveJsonModule": True
-        },
-        "include": ["./**/*.ts"],
-        "exclude": ["node_modules", "dist", "**/*.test.ts"]
-    }
-    
-    readme = f"""# {title}
+    return render_project("plugin", template_context(config, "An OpenClaw plugin"))
 
-{desc}
 
-## Installation
-
-```bash
-npm install @openclaw/{name}
-openclaw plugins install @openclaw/{name}
-```
-
-## Development
+def web_template(config):
+    return render_project("web", template_context(config, "Web app with OpenClaw integration"))
 
-```bash
-npm install
-npm run build
-openclaw plugins install -l .
-```
 
-See [OpenClaw Plugin Docs](/plugin.md) for details.
-"""
-    
-    return {
-        "index.ts": index_ts,
-        "package.json": json.dumps(package_json, indent=2) + "\n",
-        "tsconfig.json": json.dumps(tsconfig, indent=2) + "\n",
-        "README.md": readme
-    }
+STATUS_LABELS = {"added": "Created", "modified": "Updated", "unchanged": "Unchanged"}
 
 
-def web_template(config):
+def generate(out_dir, config, quiet=False):
+    ptype = config["project_type"]
     name = config["project_name"]
-    title = title_case(name)
-    desc = config.get("description", "Web app with OpenClaw integration")
-    
-    page_tsx = """import {{ React }} from 'react';
-import Link from 'next/link';
-
-export default function Home() {{
-  return (
-    <main style={{ padding: '2rem', fontFamily: 'system-ui' }}>
-      <h1>Welcome to {title}</h1>
-      <p>{desc}</p>
-      <ul>
-        <li><Link href="/demo">Demo Page</Link></li>
-        <li><Link href="/api/openclaw/test">Test OpenClaw API</Link></li>
-      </ul>
-    </main>
-  );
-}}
-""".format(title=title, desc=desc)
+    proj_dir = Path(out_dir) / name
     
-    api_route = """import { NextResponse } from 'next/server';
-
-const OPENCLAW_BASE = process.env.OPENCLAW_BASE_URL || 'http://localhost:18789';
-const OPENCLAW_TOKEN = process.env.OPENCLAW_TOKEN;
-
-export async function POST() {
-  try {
-    const response = await fetch(OPENCLAW_BASE + '/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${{OPENCLAW_TOKEN}}`,
-        'x-openclaw-agent-id': 'main',
-      },
-      body: JSON.stringify({
-        model: 'openclaw:main',
-        messages: [
-          { role: 'system', content: 'You are a helpful assistant.' },
-          { role: 'user', content: 'Hello from web app!' }
-        ],
-      }),
-    });
-
-    const data = await response.json();
-    return NextResponse.json({ success: true, data });
-  } catch (error) {
-    return NextResponse.json(
-      { success: false, error: error.message },
-      { status: 500 }
-    );
-  }
-}
-"""
+    if ptype not in TYPE_TEMPLATES:
+        raise ValueError(f"Unknown type: {ptype}")
+    files = TYPE_TEMPLATES[ptype](config)
     
-    lib_openclaw = """// OpenClaw API wrapper
-const BASE = process.env.OPENCLAW_BASE_URL || 'http://localhost:18789';
-const TOKEN = process.env.OPENCLAW_TOKEN;
-
-export async function callOpenClaw(messages, agentId = 'main') {
-  const response = await fetch(BASE + '/v1/chat/completions', {
-    method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-      'Authorization': `Bearer ${{TOKEN}}`,
-      'x-openclaw-agent-id': agentId,
-    },
-    body: JSON.stringify({
-      model: `openclaw:${{agentId}}`,
-      messages,
-    }),
-  });
-  return response.json();
-}
-
-export { callOpenClaw };
-"""
+    writer = ProjectWriter(proj_dir)
+    for rel, content in files.items():
+        writer.write(rel, content)
+    changes = writer.commit()
+    if not quiet:
+        for rel, status in changes.items():
+            print(f"  {STATUS_LABELS[status]}: {rel}")
     
-    return {
-        "app/page.tsx": page_tsx,
-        "app/layout.tsx": """import './globals.css';
-import { Inter } from 'next/font/google';
-
-const inter = Inter({ subsets: ['latin'] });
-
-export const metadata = {
-  title: 'OpenClaw Web App',
-  description: 'Web application integrated with OpenClaw',
-};
-
-export default function RootLayout({ children }) {
-  return (
-    <html lang="en">
-      <body className={inter.className}>{children}</body>
-    </html>
-  );
-}
-""",
-        "app/globals.css": """* { box-sizing: border-box; }
-body { margin: 0; padding: 0; font-family: system-ui, sans-serif; }
-""",
-        "app/api/openclaw/test/route.ts": api_route,
-        "lib/openclaw.ts": lib_openclaw,
-        ".env.local.example": """# OpenClaw API
-OPENCLAW_BASE_URL=http://localhost:18789
-OPENCLAW_TOKEN=your_gateway_token_here
-""",
-        "next.config.js": """/** @type {import('next').NextConfig} */
-const nextConfig = {
-  env: {
-    CUSTOM_KEY: process.env.OPENCLAW_BASE_URL,
-  },
-};
-
-module.exports = nextConfig;
-""",
-        "package.json": json.dumps({
-            "name": name,
-            "version": "0.1.0",
-            "private": True,
-            "scripts": {
-                "dev": "next dev",
-                "build": "next build",
-                "start": "next start",
-                "lint": "next lint"
-            },
-            "dependencies": {
-                "next": "14",
-                "react": "^18",
-                "react-dom": "^18"
-            },
-            "devDependencies": {
-                "@types/node": "^20",
-                "@types/react": "^18",
-                "typescript": "^5"
-            }
-        }, indent=2) + "\n",
-        "tsconfig.json": """{
-  "compilerOptions": {
-    "target": "ES2017",
-    "lib": ["dom", "dom.iterable", "esnext"],
-    "allowJs": true,
-    "skipLibCheck": true,
-    "strict": true,
-    "noEmit": true,
-    "esModuleInterop": true,
-    "module": "esnext",
-    "moduleResolution": "bundler",
-    "resolveJsonModule": true,
-    "isolatedModules": true,
-    "jsx": "preserve",
-    "incremental": true,
-    "plugins": [{ "name": "next" }],
-    "paths": { "@/*": ["./*"] }
-  },
-  "include": ["next-env.d.ts", "**/*.ts", "**/*.tsx", ".next/types/**/*.ts"],
-  "exclude": ["node_modules"]
-}
-""",
-        "README.md": f"""# {title}
-
-{desc}
-
-## Quick Start
-
-1. Install dependencies:
-   ```bash
-   npm install
-   ```
+    return str(proj_dir)
 
-2. Copy `.env.local.example` to `.env.local` and fill in your OpenClaw credentials
 
-3. Run the development server:
-   ```bash
-   npm run dev
-   ```
+TYPE_CONFIGS = {"skill": skill_config, "plugin": plugin_config, "web": web_config}
+TYPE_TEMPLATES = {"skill": skill_template, "plugin": plugin_template, "web": web_template}
 
-4. Open [http://localhost:3000](http://localhost:3000) in your browser
 
-## OpenClaw Integration
+def load_batch(path):
+    """Read project specs from a JSON array or a JSONL file."""
+    text = Path(path).read_text()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
 
-This app connects to an OpenClaw Gateway via HTTP API.
 
-Deploy to Vercel, Netlify, or any Node.js host.
-"""
-    }
+def batch_config(spec):
+    """Build a full config from a batch spec, filling gaps with quick defaults."""
+    ptype = spec.get("project_type") or spec.get("type")
+    if ptype not in ALLOWED_TYPES:
+        raise ValueError(f"unknown project type: {ptype!r}")
+    name = normalize(spec.get("project_name") or spec.get("name") or "")
+    if not name:
+        raise ValueError("missing project name")
+    config = {"description": f"{ptype} project generated by openclaw-app"}
+    config.update(TYPE_CONFIGS[ptype](True))
+    config.update({k: v for k, v in spec.items() if k not in ("type", "name", "output")})
+    config["project_type"] = ptype
+    config["project_name"] = name
+    return config
 
 
-def generate(out_dir, config):
-    ptype = config["project_type"]
-    name = config["project_name"]
-    proj_dir = Path(out_dir) / name
-    ensure_dir(proj_dir)
-    
-    if ptype == "skill":
-        files = skill_template(config)
-    elif ptype == "plugin":
-        files = plugin_template(config)
-    elif ptype == "web":
-        files = web_template(config)
-    else:
-        raise ValueError(f"Unknown type: {ptype}")
-    
-    for rel, content in files.items():
-        fp = proj_dir / rel
-        ensure_dir(fp.parent)
-        write_file(fp, content)
-        print(f"  Created: {rel}")
-    
-    return str(proj_dir)
+def generate_one(out_dir, index, spec):
+    start = time.perf_counter()
+    result = {"index": index, "name": spec.get("project_name") or spec.get("name")}
+    try:
+        config = batch_config(spec)
+        result.update(name=config["project_name"], type=config["project_type"])
+        target = Path(out_dir) / spec.get("output", ".")
+        result["path"] = generate(target, config, quiet=True)
+        result["ok"] = True
+    except Exception as e:
+        result.update(ok=False, error=str(e))
+    result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def run_batch(spec_file, out_dir, jobs=None):
+    """Generate every project in ``spec_file`` on a thread pool.
+
+    Results are printed as JSON lines in completion order. Returns True
+    when all projects were generated.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    specs = load_batch(spec_file)
+    seen, results = {}, []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for index, spec in enumerate(specs):
+            name = normalize(spec.get("project_name") or spec.get("name") or "")
+            # resolved, so "a", "./a" and "b/../a" count as the same directory
+            key = (Path(out_dir) / str(spec.get("output", ".")) / name).resolve()
+            if key in seen:
+                # Two specs writing the same directory would interleave files.
+                results.append({"index": index, "name": name, "ok": False,
+                                "error": f"duplicate of spec #{seen[key]}"})
+                print(json.dumps(results[-1], ensure_ascii=False), flush=True)
+                continue
+            seen[key] = index
+            futures.append(pool.submit(generate_one, out_dir, index, spec))
+        for future in as_completed(futures):
+            results.append(future.result())
+            print(json.dumps(results[-1], ensure_ascii=False), flush=True)
+    failed = sum(not r["ok"] for r in results)
+    print(f"Generated {len(results) - failed}/{len(results)} projects", file=sys.stderr)
+    return failed == 0
+
+
+def benchmark(count):
+    """Render ``count`` projects of each type in memory and report throughput."""
+    start = time.perf_counter()
+    for ptype in TYPE_TEMPLATES:
+        project_templates(ptype)
+    print(f"Compiled templates in {(time.perf_counter() - start) * 1000:.1f}ms\n")
+    print(f"{'Type':<8} {'Projects':>9} {'Files':>7} {'Output':>9} {'Time':>9} {'Proj/s':>9}")
+    for ptype, render in TYPE_TEMPLATES.items():
+        configs = [batch_config({"type": ptype, "name": f"bench-{i}", "create_scripts": True,
+                                 "create_references": True, "create_assets": True})
+                   for i in range(count)]
+        start = time.perf_counter()
+        outputs = [render(config) for config in configs]
+        elapsed = time.perf_counter() - start
+        files = sum(len(files) for files in outputs)
+        size = sum(len(text) for files in outputs for text in files.values())
+        rate = count / elapsed if elapsed else float("inf")
+        print(f"{ptype:<8} {count:>9} {files:>7} {size / 1e6:>7.1f}MB "
+              f"{elapsed * 1000:>7.1f}ms {rate:>9.0f}")
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="OpenClaw App Generator")
     parser.add_argument("--type", choices=ALLOWED_TYPES)
     parser.add_argument("--quick", action="store_true")
     parser.add_argument("--output", default=os.getcwd())
+    parser.add_argument("--batch", metavar="SPECS",
+                        help="JSON/JSONL file of project configs to generate non-interactively")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker threads for --batch")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="render N projects of each type in memory and report timings")
     args = parser.parse_args()
     
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    
     out_dir = Path(args.output).resolve()
+    if args.batch:
+        sys.exit(0 if run_batch(args.batch, out_dir, args.jobs) else 1)
+
     print(f"OpenClaw App Generator\nWorking directory: {out_dir}\n")
     
     # Directory check
@@ -526,7 +307,11 @@ def main():
             return
     
     # State check
-    state = load_state(out_dir)
+    try:
+        state = load_state(out_dir)
+    except StateError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     if state:
         print(f"\nFound previous: stage={state['stage']}, type={state['projectType']}")
         if not args.quick:
@@ -534,10 +319,7 @@ def main():
             if resp == "no":
                 return
             if resp == "restart":
-                sd = out_dir / ".openclaw-app"
-                if sd.exists():
-                    import shutil
-                    shutil.rmtree(sd)
+                StateStore(out_dir, STATE_DIR).reset()
                 state = None
     
     # Determine type
@@ -1,72 +1,724 @@
 #!/usr/bin/env python3
 """
 OpenClaw Skill Packager - 打包 skill 为 .skill 文件
+
+Archives are reproducible: members are compressed on a process pool, then
+written in sorted order with a fixed timestamp and normalized permissions,
+so packaging an unchanged tree always yields a byte-identical .skill file.
+
+A manifest of per-file content hashes is kept next to each archive. Later
+runs skip the build when nothing changed and otherwise copy the compressed
+bytes of unchanged members straight from the previous archive.
+
+Build artifacts and local state (``__pycache__``, ``node_modules``, ``.next``,
+``.openclaw`` ...) are never packaged. A ``.skillignore`` file in the skill
+root adds gitignore-style rules on top of those defaults; ``!pattern``
+re-includes something a default excludes.
+
+Passing ``-`` as the output directory streams the archive to stdout instead
+of writing a file, e.g. ``package_app.py my-skill - | ssh host 'cat > x.skill'``.
+Only a bounded window of compressed members is held in memory at a time.
+
+``--compression`` picks the codec for every member: ``stored``,
+``deflate[:level]`` (default ``deflate:6``), ``bzip2[:level]`` or
+``lzma[:preset]``. Whatever the policy, files that are already compressed
+(images, fonts, archives, or anything whose sampled byte entropy is near
+8 bits) are stored as-is. ``--benchmark`` compares the policies on a skill.
 """
 
+import hashlib
 import json
+import math
+import os
+import re
+import struct
 import sys
-import zipfile
+import time
+import zlib
+from collections import Counter, deque, namedtuple
+from functools import partial
+from itertools import islice
 from pathlib import Path
 
+from validate import check_frontmatter
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_BZIP2 = 12
+ZIP_LZMA = 14
+
+# name -> (zip method, default level, valid levels)
+CODECS = {
+    "stored": (ZIP_STORED, None, ()),
+    "deflate": (ZIP_DEFLATED, 6, range(0, 10)),
+    "bzip2": (ZIP_BZIP2, 9, range(1, 10)),
+    "lzma": (ZIP_LZMA, 6, range(0, 10)),
+}
+DEFAULT_COMPRESSION = "deflate:6"
+BENCHMARK_POLICIES = ["stored", "deflate:1", "deflate:6", "deflate:9", "bzip2:9", "lzma:6"]
+# Minimum "version needed to extract" per method, from the zip APPNOTE.
+EXTRACT_VERSION = {ZIP_STORED: 10, ZIP_DEFLATED: 20, ZIP_BZIP2: 46, ZIP_LZMA: 63}
+
+# Formats that carry their own compression; recompressing them only burns CPU.
+INCOMPRESSIBLE_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".woff", ".woff2",
+    ".zip", ".skill", ".jar", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".zst",
+    ".br", ".mp3", ".mp4", ".m4a", ".ogg", ".webm", ".mov",
+}
+ENTROPY_SAMPLE = 4096
+ENTROPY_THRESHOLD = 7.5  # bits per byte
+
+# 1980-01-01 00:00:00, the earliest time a zip header can hold, in DOS format.
+DOS_DATE = (0 << 9) | (1 << 5) | 1
+DOS_TIME = 0
+FILE_MODE = 0o644
+EXEC_MODE = 0o755
+
+# Below this many files, starting worker processes costs more than it saves.
+PARALLEL_MIN_FILES = 16
+
+MANIFEST_VERSION = 1
+
+IGNORE_FILE = ".skillignore"
+DEFAULT_IGNORES = [
+    ".git/", ".openclaw/", ".openclaw-app/", "node_modules/", "__pycache__/",
+    ".next/", ".pytest_cache/", ".venv/", "*.py[cod]", ".DS_Store",
+    ".env.local", ".SKILL.md.index.json", IGNORE_FILE,
+]
+
+Member = namedtuple("Member", "arcname mode method crc size data digest")
+
+
 def validate_skill_structure(path):
     p = Path(path)
     if not (p / "SKILL.md").exists():
         return False, "SKILL.md missing"
-    content = (p / "SKILL.md").read_text()
-    if not content.startswith("---"):
-        return False, "SKILL.md missing YAML frontmatter"
+    # One parse per package run; loading the shared cache would cost more.
+    ok, msg, _ = check_frontmatter(p / "SKILL.md", use_cache=False)
+    if not ok:
+        return False, f"SKILL.md: {msg}"
     return True, "Valid skill structure"
 
 
-def package_skill(skill_path, output_dir=None):
-    skill_path = Path(skill_path).resolve()
-    
-    if not skill_path.exists():
-        print(f"[ERROR] Skill folder not found: {skill_path}")
+def glob_to_regex(pattern):
+    """Translate one gitignore-style glob (without ``!`` or trailing ``/``)."""
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ("" if anchored else "(?:.*/)?") + "".join(out)
+
+
+class IgnoreRules:
+    """Compiled gitignore-style matcher over paths relative to the skill root.
+
+    Without negated rules every pattern is folded into one alternation per
+    kind (any path / directories only), so a lookup is one or two regex calls.
+    """
+
+    def __init__(self, patterns):
+        self.rules = []
+        for line in patterns:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                self.rules.append((glob_to_regex(line), negate, dir_only))
+        self.ordered = any(negate for _, negate, _ in self.rules)
+        if self.ordered:
+            self.compiled = [(re.compile(rx + "$"), negate, dir_only)
+                             for rx, negate, dir_only in self.rules]
+        else:
+            self.any_path = self._union(rx for rx, _, dir_only in self.rules if not dir_only)
+            self.dir_path = self._union(rx for rx, _, dir_only in self.rules if dir_only)
+
+    @staticmethod
+    def _union(regexes):
+        regexes = list(regexes)
+        return re.compile("(?:" + "|".join(regexes) + ")$") if regexes else None
+
+    @classmethod
+    def for_skill(cls, skill_path):
+        patterns = list(DEFAULT_IGNORES)
+        ignore_file = Path(skill_path) / IGNORE_FILE
+        if ignore_file.is_file():
+            patterns += ignore_file.read_text().splitlines()
+        return cls(patterns)
+
+    def ignored(self, relpath, is_dir):
+        if not self.ordered:
+            return bool((self.any_path and self.any_path.match(relpath))
+                        or (is_dir and self.dir_path and self.dir_path.match(relpath)))
+        result = False
+        for regex, negate, dir_only in self.compiled:
+            if (is_dir or not dir_only) and regex.match(relpath):
+                result = not negate
+        return result
+
+
+def collect_files(skill_path, exclude=(), rules=None):
+    """Return sorted (arcname, path) pairs for every file in the skill.
+
+    Ignored directories are pruned during the walk, so nothing under
+    ``node_modules`` and friends is ever listed or stat'ed.
+    """
+    rules = rules or IgnoreRules.for_skill(skill_path)
+    prefix = skill_path.name + "/"
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        rel_dir = Path(dirpath).relative_to(skill_path).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = [d for d in dirnames if not rules.ignored(rel_dir + d, True)]
+        for name in filenames:
+            file_path = Path(dirpath) / name
+            if (rules.ignored(rel_dir + name, False) or file_path in exclude
+                    or not file_path.is_file()):
+                continue
+            files.append((prefix + rel_dir + name, file_path))
+    files.sort()
+    return files
+
+
+def file_mode(st):
+    return EXEC_MODE if st.st_mode & 0o100 else FILE_MODE
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_compression(spec):
+    """Normalize a ``codec[:level]`` spec, e.g. ``deflate`` -> ``deflate:6``."""
+    name, _, level = spec.partition(":")
+    if name not in CODECS:
+        raise ValueError(f"unknown compression {name!r} (choose from {', '.join(CODECS)})")
+    _, default, levels = CODECS[name]
+    if default is None:
+        if level:
+            raise ValueError(f"{name} takes no level")
+        return name
+    level = int(level) if level.isdigit() else default if not level else None
+    if level not in levels:
+        raise ValueError(f"invalid level for {name}: {spec!r}")
+    return f"{name}:{level}"
+
+
+def looks_incompressible(arcname, data):
+    """Cheap pre-check: known compressed formats, or a high-entropy head sample."""
+    if Path(arcname).suffix.lower() in INCOMPRESSIBLE_SUFFIXES:
+        return True
+    sample = data[:ENTROPY_SAMPLE]
+    if len(sample) < 512:
+        return False
+    n = len(sample)
+    entropy = -sum(c / n * math.log2(c / n) for c in Counter(sample).values())
+    return entropy > ENTROPY_THRESHOLD
+
+
+def compress_bytes(data, method, level):
+    if method == ZIP_DEFLATED:
+        co = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return co.compress(data) + co.flush()
+    if method == ZIP_BZIP2:
+        import bz2
+        return bz2.compress(data, level)
+    if method == ZIP_LZMA:
+        import lzma
+        # The .lzma container starts with 5 property bytes and an 8-byte size;
+        # zip instead wants a version, the property length, then the properties.
+        alone = lzma.compress(data, format=lzma.FORMAT_ALONE, preset=level)
+        return struct.pack("<BBH", 9, 4, 5) + alone[:5] + alone[13:]
+    return data
+
+
+def compress_data(arcname, data, mode, compression):
+    name, _, level = compression.partition(":")
+    method = CODECS[name][0]
+    crc = zlib.crc32(data)
+    digest = hashlib.sha256(data).hexdigest()
+    if method != ZIP_STORED and not looks_incompressible(arcname, data):
+        packed = compress_bytes(data, method, int(level))
+        if len(packed) < len(data):
+            return Member(arcname, mode, method, crc, len(data), packed, digest)
+    return Member(arcname, mode, ZIP_STORED, crc, len(data), data, digest)
+
+
+def compress_member(task, compression=DEFAULT_COMPRESSION):
+    """Read and compress one file. Runs inside pool workers."""
+    arcname, path, mode = task
+    return compress_data(arcname, Path(path).read_bytes(), mode, compression)
+
+
+def compress_members(tasks, jobs=None, compression=DEFAULT_COMPRESSION):
+    """Yield compressed members in the same order as ``tasks``.
+
+    At most a few members per worker are in flight, so memory stays bounded
+    even when the consumer (a pipe, say) is slower than compression.
+    """
+    work = partial(compress_member, compression=compression)
+    if jobs == 1 or len(tasks) < PARALLEL_MIN_FILES:
+        yield from map(work, tasks)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        window = 2 * (jobs or os.cpu_count() or 1)
+        todo = iter(tasks)
+        pending = deque(pool.submit(work, t) for t in islice(todo, window))
+        while pending:
+            member = pending.popleft().result()
+            for task in islice(todo, 1):
+                pending.append(pool.submit(work, task))
+            yield member
+
+
+def manifest_path(skill_file):
+    return skill_file.with_name(skill_file.name + ".manifest.json")
+
+
+def load_manifest(skill_file, settings):
+    """Return the previous manifest if it still describes ``skill_file``."""
+    try:
+        manifest = json.loads(manifest_path(skill_file).read_text())
+        st = skill_file.stat()
+    except (OSError, ValueError):
+        return None
+    archive = manifest.get("archive", {})
+    if (manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("settings") != settings
+            or archive.get("size") != st.st_size
+            or archive.get("mtime_ns") != st.st_mtime_ns):
         return None
-    
+    return manifest
+
+
+def save_manifest(skill_file, settings, files, digest):
+    st = skill_file.stat()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "settings": settings,
+        "archive": {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "files": files,
+    }
+    mp = manifest_path(skill_file)
+    tmp = mp.with_name(mp.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n")
+    os.replace(tmp, mp)
+
+
+def read_raw_members(skill_file, manifest_files, wanted):
+    """Copy compressed members out of a previous archive without inflating them."""
+    import zipfile
+
+    members = {}
+    with zipfile.ZipFile(skill_file) as zf, open(skill_file, "rb") as fp:
+        for info in zf.infolist():
+            if info.filename not in wanted:
+                continue
+            fp.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<2H", fp.read(4))
+            fp.seek(name_len + extra_len, 1)
+            entry = manifest_files[info.filename]
+            members[info.filename] = Member(
+                info.filename, entry["mode"], info.compress_type, info.CRC,
+                info.file_size, fp.read(info.compress_size), entry["sha256"])
+    return members
+
+
+def plan_members(files, previous):
+    """Split files into members reusable from ``previous`` and ones to compress.
+
+    A file whose size and mtime match the manifest is trusted without being
+    read; one whose mtime moved but content did not is still reused.
+    """
+    old = previous["files"] if previous else {}
+    entries, reuse, tasks = {}, set(), []
+    for arcname, path in files:
+        st = path.stat()
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": file_mode(st)}
+        prev = old.get(arcname)
+        if prev and prev["mode"] == entry["mode"] and prev["size"] == entry["size"]:
+            if prev["mtime_ns"] == entry["mtime_ns"] or file_digest(path) == prev["sha256"]:
+                entry["sha256"] = prev["sha256"]
+        if "sha256" in entry:
+            reuse.add(arcname)
+        else:
+            tasks.append((arcname, path, entry["mode"]))
+        entries[arcname] = entry
+    return entries, reuse, tasks
+
+
+class ArchiveWriter:
+    """Minimal zip writer for members that are already compressed.
+
+    Offsets are tracked here rather than with ``tell()``, so ``fp`` only
+    needs a ``write`` method.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.offset = 0
+        self.central = []
+        self.sha256 = hashlib.sha256()
+        self.raw_size = 0
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.sha256.update(data)
+        self.offset += len(data)
+
+    def add(self, member):
+        if (member.size > 0xFFFFFFFF or len(member.data) > 0xFFFFFFFF
+                or self.offset > 0xFFFFFFFF):
+            raise ValueError(f"{member.arcname}: archive too large for a .skill file")
+        try:
+            name = member.arcname.encode("ascii")
+            flags = 0
+        except UnicodeEncodeError:
+            name = member.arcname.encode("utf-8")
+            flags = 0x800
+        if member.method == ZIP_LZMA:
+            flags |= 0x02  # stream ends with an end-of-stream marker
+        version = EXTRACT_VERSION[member.method]
+        header_offset = self.offset
+        self._write(struct.pack(
+            "<4s5H3L2H", b"PK\x03\x04", version, flags, member.method,
+            DOS_TIME, DOS_DATE, member.crc, len(member.data), member.size,
+            len(name), 0))
+        self._write(name)
+        self._write(member.data)
+        self.raw_size += member.size
+        self.central.append(struct.pack(
+            "<4s6H3L5H2L", b"PK\x01\x02", (3 << 8) | version, version, flags,
+            member.method, DOS_TIME, DOS_DATE, member.crc, len(member.data),
+            member.size, len(name), 0, 0, 0, 0,
+            (0o100000 | member.mode) << 16, header_offset) + name)
+
+    def close(self):
+        if len(self.central) > 0xFFFF:
+            raise ValueError("too many files for a .skill archive")
+        start = self.offset
+        for record in self.central:
+            self._write(record)
+        self._write(struct.pack(
+            "<4s4H2LH", b"PK\x05\x06", 0, 0, len(self.central),
+            len(self.central), self.offset - start, start, 0))
+
+
+def write_archive(fp, files, tasks, jobs=None, reused=None, on_member=None,
+                  compression=DEFAULT_COMPRESSION):
+    """Write ``files`` to ``fp`` in order, compressing ``tasks`` and taking
+    everything else from ``reused``. Returns the closed ArchiveWriter."""
+    reused = reused or {}
+    compressed = compress_members(tasks, jobs, compression)
+    try:
+        writer = ArchiveWriter(fp)
+        for arcname, _ in files:
+            member = reused.get(arcname) or next(compressed)
+            writer.add(member)
+            if on_member:
+                on_member(member)
+        writer.close()
+    finally:
+        compressed.close()
+    return writer
+
+
+def stream_skill(skill_path, fp, jobs=None, verbose=False, compression=DEFAULT_COMPRESSION):
+    """Write the archive for ``skill_path`` to the writable binary ``fp``.
+
+    Nothing touches the disk besides reading the skill, so ``fp`` can be a
+    pipe or socket. Progress goes to stderr. Returns the archive's sha256.
+    """
+    def log(*args):
+        print(*args, file=sys.stderr)
+
+    skill_path = Path(skill_path).resolve()
     if not (skill_path / "SKILL.md").exists():
-        print(f"[ERROR] SKILL.md not found in {skill_path}")
+        log(f"[ERROR] SKILL.md not found in {skill_path}")
         return None
-    
-    print("Validating...")
     valid, msg = validate_skill_structure(skill_path)
     if not valid:
-        print(f"[ERROR] {msg}")
+        log(f"[ERROR] {msg}")
+        return None
+
+    files = collect_files(skill_path)
+    tasks = [(arcname, path, file_mode(path.stat())) for arcname, path in files]
+
+    def added(member):
+        if verbose:
+            log(f"  + {member.arcname}")
+
+    writer = write_archive(fp, files, tasks, jobs, on_member=added, compression=compression)
+    fp.flush()
+    digest = writer.sha256.hexdigest()
+    log(f"✅ Streamed {skill_path.name}.skill: {len(files)} files, "
+        f"{writer.raw_size} -> {writer.offset} bytes, sha256 {digest}")
+    return digest
+
+
+def package_skill(skill_path, output_dir=None, jobs=None, verbose=False, force=False,
+                  quiet=False, stats=None, compression=DEFAULT_COMPRESSION):
+    """Package one skill folder; ``stats``, if given, is filled with build figures."""
+    log = (lambda *args: None) if quiet else print
+    stats = {} if stats is None else stats
+    skill_path = Path(skill_path).resolve()
+    stats.update(name=skill_path.name, status="failed")
+
+    def fail(msg):
+        stats["error"] = msg
+        log(f"[ERROR] {msg}")
         return None
-    print(f"[OK] {msg}\n")
-    
-    output_path = Path(output_dir) if output_dir else Path.cwd()
+
+    if not skill_path.exists():
+        return fail(f"Skill folder not found: {skill_path}")
+
+    if not (skill_path / "SKILL.md").exists():
+        return fail(f"SKILL.md not found in {skill_path}")
+
+    log("Validating...")
+    valid, msg = validate_skill_structure(skill_path)
+    if not valid:
+        return fail(msg)
+    log(f"[OK] {msg}\n")
+
+    output_path = Path(output_dir).resolve() if output_dir else Path.cwd()
     output_path.mkdir(parents=True, exist_ok=True)
-    
+
     skill_file = output_path / f"{skill_path.name}.skill"
-    
-    print(f"Packaging to {skill_file}...")
-    with zipfile.ZipFile(skill_file, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in skill_path.rglob("*"):
-            if file_path.is_file():
-                arcname = file_path.relative_to(skill_path.parent)
-                zipf.write(file_path, arcname)
-                print(f"  + {arcname}")
-    
-    print(f"\n✅ Packaged: {skill_file}")
+    tmp_file = skill_file.with_name(skill_file.name + ".tmp")
+
+    log(f"Packaging to {skill_file}...")
+    exclude = {skill_file, tmp_file, manifest_path(skill_file)}
+    files = collect_files(skill_path, exclude=exclude)
+    settings = {"compression": compression}
+    previous = None if force else load_manifest(skill_file, settings)
+    entries, reuse, tasks = plan_members(files, previous)
+    stats.update(files=len(files), raw_size=sum(e["size"] for e in entries.values()))
+
+    if previous and not tasks and set(entries) == set(previous["files"]):
+        if entries != previous["files"]:
+            # Only mtimes moved; record them so the next run need not rehash.
+            save_manifest(skill_file, settings, entries, previous["archive"]["sha256"])
+        stats.update(status="skipped", size=skill_file.stat().st_size)
+        log(f"[SKIP] {skill_file.name} is up to date")
+        return skill_file
+
+    reused = read_raw_members(skill_file, previous["files"], reuse) if reuse else {}
+
+    def added(member):
+        entries[member.arcname]["sha256"] = member.digest
+        if verbose:
+            log(f"  {'=' if member.arcname in reused else '+'} {member.arcname}")
+
+    try:
+        with open(tmp_file, "wb") as fp:
+            writer = write_archive(fp, files, tasks, jobs, reused, added, compression)
+        os.replace(tmp_file, skill_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    save_manifest(skill_file, settings, entries, writer.sha256.hexdigest())
+
+    size = skill_file.stat().st_size
+    stats.update(status="packaged", raw_size=writer.raw_size, size=size)
+    log(f"  {len(files)} files ({len(tasks)} compressed, {len(reused)} reused), "
+        f"{writer.raw_size} -> {size} bytes")
+    log(f"\n✅ Packaged: {skill_file}")
     return skill_file
 
 
+def discover_skills(pattern):
+    """Find skill folders (directories holding SKILL.md) under a root or glob."""
+    if any(c in pattern for c in "*?["):
+        import glob
+        roots = [Path(p) for p in glob.glob(pattern)]
+    else:
+        roots = [Path(pattern)]
+    found = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            if "SKILL.md" in filenames:
+                found.add(Path(dirpath).resolve())
+                # A nested skill is already packaged as part of this one.
+                dirnames[:] = []
+            else:
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")
+                               and d not in ("node_modules", "__pycache__")]
+    return sorted(found)
+
+
+def package_one(task):
+    """Package a single skill quietly for batch mode. Runs inside pool workers."""
+    skill_path, output_dir, force, compression = task
+    stats = {}
+    start = time.perf_counter()
+    try:
+        package_skill(skill_path, output_dir, jobs=1, force=force, quiet=True, stats=stats,
+                      compression=compression)
+    except Exception as e:
+        stats.update(status="failed", error=str(e))
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def human_size(n):
+    for unit in ("B", "K", "M"):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}G"
+
+
+def print_summary(results, elapsed):
+    print(f"\n{'Skill':<28} {'Files':>6} {'Raw':>9} {'Packed':>9} {'Ratio':>7} {'Time':>8}  Status")
+    for r in results:
+        raw, size = r.get("raw_size", 0), r.get("size", 0)
+        ratio = f"{size / raw:.1%}" if raw and size else "-"
+        print(f"{r['name']:<28} {r.get('files', 0):>6} {human_size(raw):>9} "
+              f"{human_size(size):>9} {ratio:>7} {r['seconds']:>7.2f}s  {r['status']}")
+        if r.get("error"):
+            print(f"    [ERROR] {r['error']}")
+    raw = sum(r.get("raw_size", 0) for r in results)
+    size = sum(r.get("size", 0) for r in results)
+    ratio = f"{size / raw:.1%}" if raw else "-"
+    print(f"{'TOTAL':<28} {sum(r.get('files', 0) for r in results):>6} {human_size(raw):>9} "
+          f"{human_size(size):>9} {ratio:>7} {elapsed:>7.2f}s")
+
+
+def package_batch(pattern, output_dir=None, jobs=None, force=False,
+                  compression=DEFAULT_COMPRESSION):
+    """Package every skill found under ``pattern`` concurrently, one skill per worker."""
+    skills = discover_skills(pattern)
+    if not skills:
+        print(f"[ERROR] No SKILL.md found under {pattern}")
+        return False
+    names = [s.name for s in skills]
+    clashes = sorted({n for n in names if names.count(n) > 1})
+    if clashes:
+        print(f"[ERROR] Skill names would collide in the output directory: {', '.join(clashes)}")
+        return False
+
+    output_path = Path(output_dir).resolve() if output_dir else Path.cwd()
+    print(f"Packaging {len(skills)} skills to {output_path}...")
+    tasks = [(str(s), str(output_path), force, compression) for s in skills]
+    start = time.perf_counter()
+    if jobs == 1 or len(tasks) == 1:
+        results = list(map(package_one, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(package_one, tasks))
+    print_summary(results, time.perf_counter() - start)
+    return all(r["status"] != "failed" for r in results)
+
+
+def benchmark(skill_path, policies=BENCHMARK_POLICIES):
+    """Compress a skill in memory under each policy and report size and speed."""
+    skill_path = Path(skill_path).resolve()
+    if not (skill_path / "SKILL.md").exists():
+        print(f"[ERROR] SKILL.md not found in {skill_path}")
+        return False
+    files = [(arcname, path.read_bytes()) for arcname, path in collect_files(skill_path)]
+    raw = sum(len(data) for _, data in files)
+    print(f"Benchmarking {skill_path.name}: {len(files)} files, {human_size(raw)}\n")
+    print(f"{'Policy':<12} {'Packed':>9} {'Ratio':>7} {'Time':>9} {'MB/s':>8} {'Stored':>7}")
+    for policy in policies:
+        start = time.perf_counter()
+        members = [compress_data(arcname, data, FILE_MODE, policy) for arcname, data in files]
+        elapsed = time.perf_counter() - start
+        packed = sum(len(m.data) for m in members)
+        stored = sum(m.method == ZIP_STORED for m in members)
+        speed = raw / elapsed / 1e6 if elapsed else float("inf")
+        ratio = f"{packed / raw:.1%}" if raw else "-"
+        print(f"{policy:<12} {human_size(packed):>9} {ratio:>7} "
+              f"{elapsed * 1000:>7.1f}ms {speed:>8.1f} {stored:>7}")
+    return True
+
+
+def compression_arg(spec):
+    import argparse
+
+    try:
+        return parse_compression(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python package_app.py <skill-folder> [output-dir]")
-        print("\nExample:")
-        print("  python package_app.py my-skill")
-        print("  python package_app.py my-skill ./dist")
-        sys.exit(1)
-    
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
-    
-    result = package_skill(skill_path, output_dir)
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Package an OpenClaw skill folder into a .skill file",
+        epilog="Examples: python package_app.py my-skill ./dist\n"
+               "          python package_app.py --batch skills/ ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("skill_folder",
+                        help="skill folder, or a root directory / glob with --batch")
+    parser.add_argument("output_dir", nargs="?",
+                        help="where to write <name>.skill; '-' streams it to stdout")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="list every packaged file")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the manifest and rebuild from scratch")
+    parser.add_argument("--batch", action="store_true",
+                        help="package every skill found under skill_folder")
+    parser.add_argument("--compression", type=compression_arg, default=DEFAULT_COMPRESSION,
+                        help="stored, deflate[:0-9], bzip2[:1-9] or lzma[:0-9] "
+                             f"(default: {DEFAULT_COMPRESSION})")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare size and speed of compression policies, write nothing")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        sys.exit(0 if benchmark(args.skill_folder) else 1)
+
+    if args.batch:
+        ok = package_batch(args.skill_folder, args.output_dir, args.jobs, args.force,
+                           args.compression)
+        sys.exit(0 if ok else 1)
+
+    if args.output_dir == "-":
+        result = stream_skill(args.skill_folder, sys.stdout.buffer, args.jobs, args.verbose,
+                              args.compression)
+        sys.exit(0 if result else 1)
+
+    result = package_skill(args.skill_folder, args.output_dir, args.jobs,
+                           args.verbose, args.force, compression=args.compression)
     sys.exit(0 if result else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
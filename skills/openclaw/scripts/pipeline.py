@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Pipeline - 单进程执行 init → prd → nextjs
+
+Runs the three stage scripts (openclaw-init, openclaw-prd, openclaw-nextjs)
+in one interpreter from a declarative answers file instead of three
+interactive launches. The state is passed between stages in memory and
+written to .openclaw/state.json (via state_store) only at stage boundaries,
+so an interrupted run resumes after the last completed stage.
+
+Answers file (JSON):
+
+    {
+      "project": {"name": "notes-app", "description": "...", "author": "..."},
+      "config":  {"gateway_url": "http://localhost:18789", "gateway_token": null},
+      "modules": {"web": true, "skill": true, "database": "sqlite"},
+      "prd":     {"summary": "...", "features": ["..."], "tech_stack": "nextjs"}
+    }
+
+Unanswered questions take the same defaults as the interactive scripts.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import stages
+from state_store import StateError, StateStore
+
+SKILLS_DIR = Path(__file__).resolve().parents[2]
+STAGE_SCRIPTS = {
+    "init": SKILLS_DIR / "openclaw-init" / "scripts" / "init.py",
+    "prd": SKILLS_DIR / "openclaw-prd" / "scripts" / "define_prd.py",
+    "nextjs": SKILLS_DIR / "openclaw-nextjs" / "scripts" / "generate_nextjs.py",
+}
+
+_modules = {}
+
+
+def load_stage(name):
+    """Import a stage script once by path (they live in other skills' folders)."""
+    module = _modules.get(name)
+    if module is None:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(f"openclaw_{name}", STAGE_SCRIPTS[name])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return module
+
+
+def run_init(root, state, answers):
+    init = load_stage("init")
+    state = init.new_state(answers.get("project", {}), answers.get("config"), answers.get("modules"))
+    init.write_claude_md(root, state)
+    init.ensure_gitignore(root)
+    return state
+
+
+def run_prd(root, state, answers):
+    define_prd = load_stage("prd")
+    modules, prd_answers = state.get("modules", {}), answers.get("prd", {})
+    errors, warnings = define_prd.validate_answers(modules, prd_answers)
+    if errors:
+        raise ValueError("; ".join(errors))
+    for w in warnings:
+        print(f"  ⚠️  {w}")
+    state["prd"] = define_prd.prd_from_answers(modules, prd_answers, state.get("prd"))
+    return state
+
+
+def run_nextjs(root, state, answers):
+    writer = load_stage("nextjs").build_project(root, state)
+    changes = writer.commit()
+    written = sum(1 for s in changes.values() if s in ("added", "modified", "removed"))
+    print(f"  更新 {written} 个文件（共 {len(changes)} 个）: {writer.root}")
+    return state
+
+
+# (stage script, state["stage"] once it has completed, runner), in stage order
+STAGES = [
+    ("init", stages.INIT, run_init),
+    ("prd", stages.PRD, run_prd),
+    ("nextjs", stages.READY, run_nextjs),
+]
+
+
+def completed_index(state):
+    """Index into STAGES of the last completed stage, -1 if none."""
+    done = stages.current(state)
+    return -1 if done is None else stages.ordinal(done)
+
+
+def run_pipeline(root, answers, start=None, restart=False):
+    """Run the stages after the last completed one (or from ``start``).
+
+    Returns the final state and a list of (stage, seconds) for stages run.
+    """
+    store = StateStore(root)
+    state = None if restart else store.load()
+    names = [name for name, _, _ in STAGES]
+    first = names.index(start) if start else completed_index(state) + 1
+    if first > 0 and state is None:
+        raise StateError(f"{store.path} 不存在，无法从 {names[first]} 阶段开始")
+    if first == 0:
+        state = None  # init builds a fresh state
+    timings = []
+    for name, marks, runner in STAGES[first:]:
+        print(f"\n=== [{name}] ===")
+        began = time.perf_counter()
+        started = stages.begin(state, marks)
+        state = stages.complete(runner(root, state, answers), marks, started)
+        state = store.save(state)
+        timings.append((name, time.perf_counter() - began))
+    return state, timings
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run init → prd → nextjs in one process")
+    parser.add_argument("answers", help="JSON answers file")
+    parser.add_argument("--output", default=os.getcwd(), help="workspace directory")
+    parser.add_argument("--from", dest="start", choices=list(STAGE_SCRIPTS),
+                        help="re-run from this stage instead of resuming")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the saved state and run every stage")
+    args = parser.parse_args()
+
+    root = Path(args.output).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        answers = json.loads(Path(args.answers).read_text(encoding="utf-8"))
+        start = time.perf_counter()
+        state, timings = run_pipeline(root, answers, args.start, args.restart)
+    except (OSError, ValueError, StateError) as e:  # StageError is a ValueError
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not timings:
+        print(f"所有阶段均已完成（stage={state.get('stage')}），使用 --from 或 --restart 重新执行。")
+        return
+    print("\n阶段耗时:")
+    for name, seconds in timings:
+        print(f"  {name:<8} {seconds * 1000:>8.1f}ms")
+    print(f"  {'total':<8} {(time.perf_counter() - start) * 1000:>8.1f}ms")
+    print(f"\n✅ stage={state['stage']}，项目: {state['project']['name']}")
+
+
+if __name__ == "__main__":
+    main()
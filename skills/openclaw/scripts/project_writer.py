@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Project Writer - 生成项目文件的事务式写入
+
+Generators hand every file to a ProjectWriter instead of writing it
+directly. Nothing touches the target until commit(): changed files are
+written into a staging directory next to the project (same filesystem),
+creating each directory once, then renamed into place. A brand-new
+project appears with a single directory rename; an existing one gets a
+per-file atomic os.replace, so a crash never leaves half-written files
+and concurrent runs never see a torn file. Files whose content is already
+on disk are skipped. changes() and diff() give a dry run of the same
+comparison without writing anything.
+
+With ``manifest`` set, commit() also records every generated file and its
+sha256 in that file (relative to the project). A later run reports files
+the manifest tracks but that are no longer generated: "removed" when they
+are untouched since generation (commit() deletes them), "orphaned" when
+the user has edited them (kept on disk and dropped from the manifest).
+
+Shared by init_app.py and openclaw-nextjs/scripts/generate_nextjs.py.
+"""
+
+import os
+from pathlib import Path
+
+
+class ProjectWriter:
+    """Collects a project's files in memory and commits them atomically.
+
+    Usable as a context manager: commits on success, discards on error.
+    """
+
+    def __init__(self, root, skip_unchanged=True, fsync=False, manifest=None):
+        self.root = Path(root)
+        self.skip_unchanged = skip_unchanged
+        self.fsync = fsync
+        self.manifest = manifest
+        self.files = {}
+        self.result = None
+
+    def write(self, rel, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[Path(rel).as_posix()] = content
+
+    def read(self, rel):
+        """Pending content of ``rel`` (for generators that append to a file)."""
+        return self.files[Path(rel).as_posix()].decode("utf-8")
+
+    def changes(self):
+        """Return {rel: "added" | "modified" | "unchanged" | "removed" | "orphaned"}.
+
+        The last two only occur with a manifest, for tracked files that are
+        no longer generated.
+        """
+        import hashlib
+
+        status = {}
+        for rel, content in sorted(self.files.items()):
+            target = self.root / rel
+            try:
+                same = target.stat().st_size == len(content) and target.read_bytes() == content
+            except OSError:
+                status[rel] = "added"
+                continue
+            status[rel] = "unchanged" if same else "modified"
+        for rel, digest in sorted(self._tracked().items()):
+            if rel in self.files:
+                continue
+            try:
+                on_disk = hashlib.sha256((self.root / rel).read_bytes()).hexdigest()
+            except OSError:
+                continue  # already gone
+            status[rel] = "removed" if on_disk == digest else "orphaned"
+        return status
+
+    def diff(self, rel, context=3):
+        """Unified diff lines turning the on-disk ``rel`` into the pending one."""
+        import difflib
+
+        rel = Path(rel).as_posix()
+        try:
+            old = (self.root / rel).read_bytes().decode("utf-8", "replace").splitlines(True)
+            fromfile = "a/" + rel
+        except OSError:
+            old, fromfile = [], "/dev/null"
+        if rel in self.files:
+            new, tofile = self.files[rel].decode("utf-8", "replace").splitlines(True), "b/" + rel
+        else:
+            new, tofile = [], "/dev/null"  # a removed file
+        return difflib.unified_diff(old, new, fromfile, tofile, n=context)
+
+    def commit(self):
+        """Apply pending files. Returns the changes() map that was applied."""
+        status = self.changes()
+        files = dict(self.files)
+        todo = [rel for rel, s in status.items()
+                if s in ("added", "modified") or (s == "unchanged" and not self.skip_unchanged)]
+        removed = [rel for rel, s in status.items() if s == "removed"]
+        if self.manifest:
+            files[self.manifest] = self._manifest_bytes()
+            target = self.root / self.manifest
+            if todo or removed or not target.exists() or target.read_bytes() != files[self.manifest]:
+                todo.append(self.manifest)
+        self.result = status
+        if not todo:
+            return status
+
+        self.root.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.root.parent / f".{self.root.name}.{os.urandom(6).hex()}.staging"
+        os.mkdir(staging)
+        try:
+            self._stage(staging, todo, files)
+            if not self.root.exists():
+                try:
+                    os.rename(staging, self.root)
+                    self._sync_dir(self.root.parent)
+                    return status
+                except OSError:
+                    pass  # another run created the project first; merge file by file
+            made = set()
+            for rel in todo:
+                target = self.root / rel
+                if target.parent not in made:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    made.add(target.parent)
+                os.replace(staging / rel, target)
+            for rel in removed:
+                self._remove(rel)
+                made.add((self.root / rel).parent)
+            for d in made:
+                if d.exists():
+                    self._sync_dir(d)
+        finally:
+            if staging.exists():
+                import shutil
+                shutil.rmtree(staging, ignore_errors=True)
+        return status
+
+    def discard(self):
+        self.files.clear()
+
+    def _tracked(self):
+        """{rel: sha256} recorded by the previous commit, or {} without a manifest."""
+        if not self.manifest:
+            return {}
+        import json
+
+        try:
+            tracked = json.loads((self.root / self.manifest).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        files = tracked.get("files") if isinstance(tracked, dict) else None
+        if not isinstance(files, dict):
+            return {}
+        # never reach outside the project, whatever the manifest says
+        return {rel: digest for rel, digest in files.items()
+                if not Path(rel).is_absolute() and ".." not in Path(rel).parts}
+
+    def _manifest_bytes(self):
+        import hashlib
+        import json
+
+        files = {rel: hashlib.sha256(content).hexdigest()
+                 for rel, content in sorted(self.files.items())}
+        return (json.dumps({"files": files}, indent=2) + "\n").encode("utf-8")
+
+    def _remove(self, rel):
+        """Delete ``rel`` and the directories it leaves empty, up to the root."""
+        path = self.root / rel
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        parent = path.parent
+        while parent != self.root:
+            try:
+                parent.rmdir()
+            except OSError:  # not empty
+                break
+            parent = parent.parent
+
+    def _stage(self, staging, todo, files):
+        made = set()
+        for rel in todo:
+            path = staging / rel
+            if path.parent not in made:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                made.add(path.parent)
+            with open(path, "wb") as f:
+                f.write(files[rel])
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        for d in made:
+            self._sync_dir(d)
+
+    def _sync_dir(self, path):
+        if not self.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
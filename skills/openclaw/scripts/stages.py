@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Stages - 项目阶段状态机
+
+The ``stage`` field of .openclaw/state.json moves through ordered stages:
+
+    init (0) → prd (1) → ready (2)
+
+Only the transitions in TRANSITIONS are allowed; begin() and complete()
+raise StageError on any other.
+
+Compare stages with ordinal()/reached() rather than string comparison.
+Each completed stage records its timing in ``state["stageTimes"][stage]``
+(startedAt, completedAt, seconds) so time per stage can be measured across
+projects (see ``state_index.py timings``).
+
+    started = stages.begin(state, "prd")      # validates the transition
+    ...
+    stages.complete(state, "prd", started)    # sets stage and timing stamps
+"""
+
+import time
+
+INIT, PRD, READY = "init", "prd", "ready"
+STAGES = (INIT, PRD, READY)
+ORDER = {stage: i for i, stage in enumerate(STAGES)}
+
+# current stage -> stages it may move to: the next stage, or the same one again
+# (re-running it). init -> ready is the --quick path, ready -> prd re-defines
+# the requirements of a generated project. Nothing goes back to init: that
+# starts over from an empty state (StateStore.reset(), pipeline --restart).
+TRANSITIONS = {
+    None: {INIT},
+    INIT: {INIT, PRD, READY},
+    PRD: {PRD, READY},
+    READY: {PRD, READY},
+}
+
+
+class StageError(ValueError):
+    pass
+
+
+def isoformat(timestamp=None):
+    """Local time as ``YYYY-MM-DDTHH:MM:SS`` (datetime's isoformat, without importing it)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp))
+
+
+def ordinal(stage):
+    try:
+        return ORDER[stage]
+    except KeyError:
+        raise StageError(f"未知阶段: {stage!r}（可选: {', '.join(STAGES)}）") from None
+
+
+def current(state):
+    """The completed stage recorded in ``state`` (None before init)."""
+    stage = state.get("stage") if state else None
+    if stage is not None:
+        ordinal(stage)
+    return stage
+
+
+def reached(state, stage):
+    """True once ``state`` has completed ``stage`` or a later one."""
+    done = current(state)
+    return done is not None and ordinal(done) >= ordinal(stage)
+
+
+def check_transition(state, target):
+    ordinal(target)
+    source = current(state)
+    if target not in TRANSITIONS[source]:
+        raise StageError(f"不能从 {source or '(未初始化)'} 进入 {target}")
+
+
+def begin(state, target):
+    """Validate moving ``state`` to ``target``; returns the start timestamp."""
+    check_transition(state, target)
+    return time.time()
+
+
+def complete(state, target, started):
+    """Mark ``target`` as the current stage and record its timing stamps."""
+    check_transition(state, target)
+    finished = time.time()
+    state["stage"] = target
+    state.setdefault("stageTimes", {})[target] = {
+        "startedAt": isoformat(started),
+        "completedAt": isoformat(finished),
+        "seconds": round(finished - started, 3),
+    }
+    return state
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Startup Benchmark - 技能脚本启动耗时基线
+
+The gateway launches the skill scripts as short-lived subprocesses, so for
+small actions (printing the reference, a single validation) interpreter
+startup and imports are most of the cost. This measures each script with
+``python -X importtime`` in a fresh interpreter, REPEAT times, keeping the
+fastest run, and compares it with startup_baseline.json:
+
+    python startup_bench.py              # compare, exit 1 on new imports
+    python startup_bench.py --strict-time  # also fail on slower imports
+    python startup_bench.py -v           # also list the slowest imports
+    python startup_bench.py --update     # record a new baseline
+
+Scripts with an argv in SCRIPTS are run as ``__main__`` with it (their fast
+path); the rest are only imported, which is the fixed cost paid before
+main() parses anything. Heavy modules (argparse, json, zipfile, shutil,
+...) should be imported inside the functions that need them.
+
+A regression is a top-level module newly imported at startup, which is
+deterministic. Import times depend on the machine and its load, so they
+are only reported by default; with --strict-time an import time above
+``baseline * (1 + tolerance) + slack`` ms fails too, for a baseline
+recorded on the same machine.
+"""
+
+import os
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILLS_DIR = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
+BASELINE = os.path.join(SCRIPTS_DIR, "startup_baseline.json")
+REPEAT = 7
+
+# name -> (script path relative to skills/, argv to run main() with, or None to import only)
+SCRIPTS = {
+    "show_reference": ("openclaw-reference/scripts/show_reference.py", []),
+    "show_reference_query": ("openclaw-reference/scripts/show_reference.py", ["chat", "completions"]),
+    "search_docs": ("openclaw-reference/scripts/search_docs.py", None),
+    "init": ("openclaw-init/scripts/init.py", None),
+    "define_prd": ("openclaw-prd/scripts/define_prd.py", None),
+    "generate_nextjs": ("openclaw-nextjs/scripts/generate_nextjs.py", None),
+    "init_app": ("openclaw/scripts/init_app.py", None),
+    "validate": ("openclaw/scripts/validate.py", None),
+    "package_app": ("openclaw/scripts/package_app.py", None),
+    "pipeline": ("openclaw/scripts/pipeline.py", None),
+    "state_store": ("openclaw/scripts/state_store.py", None),
+    "state_index": ("openclaw/scripts/state_index.py", None),
+}
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative)))
+    return rows
+
+
+def run_once(args):
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, stdin=subprocess.DEVNULL,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                          cwd=SKILLS_DIR)
+    if proc.returncode:
+        tail = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError(f"{' '.join(args)} exited {proc.returncode}: {' '.join(tail[-3:])}")
+    return parse_importtime(proc.stderr)
+
+
+def command(path, argv):
+    full = os.path.join(SKILLS_DIR, path)
+    if argv is not None:
+        return [full] + argv
+    name = os.path.splitext(os.path.basename(full))[0]
+    code = (f"import sys; sys.path[:0] = [{os.path.dirname(full)!r}, {SCRIPTS_DIR!r}]; "
+            f"import {name}")
+    return ["-c", code]
+
+
+def measure(args, bare):
+    """Fastest of REPEAT runs: (ms, sorted top-level modules, rows)."""
+    best = None
+    for _ in range(REPEAT):
+        rows = [r for r in run_once(args) if r[0] not in bare]
+        total = sum(r[1] for r in rows)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    modules = sorted({r[0].split(".")[0] for r in rows} - {""})
+    return total / 1000, [m for m in modules if not m.startswith("_")], rows
+
+
+def check(results, baseline, tolerance, slack, strict_time=False):
+    failures = []
+    for name, (ms, modules, _) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        new = sorted(set(modules) - set(base["modules"]))
+        if new:
+            failures.append(f"{name}: now imports {', '.join(new)} at startup")
+        if not strict_time:
+            continue
+        limit = base["ms"] * (1 + tolerance) + slack
+        if ms > limit:
+            failures.append(f"{name}: {ms:.1f}ms > {limit:.1f}ms (baseline {base['ms']:.1f}ms)")
+    return failures
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Measure skill script startup against a baseline")
+    parser.add_argument("scripts", nargs="*", metavar="SCRIPT",
+                        help=f"scripts to measure (default: all of {', '.join(SCRIPTS)})")
+    parser.add_argument("--update", action="store_true", help="write the measurements as the baseline")
+    parser.add_argument("--strict-time", action="store_true",
+                        help="also fail when an import time exceeds the baseline limit")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative slowdown with --strict-time (default 0.5)")
+    parser.add_argument("--slack", type=float, default=3.0,
+                        help="allowed absolute slowdown in ms with --strict-time (default 3)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the slowest imports")
+    args = parser.parse_args()
+    unknown = [name for name in args.scripts if name not in SCRIPTS]
+    if unknown:
+        parser.error(f"unknown script(s): {', '.join(unknown)}")
+
+    bare = {r[0] for r in run_once(["-c", "pass"])}
+    stored = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            stored = json.load(f)
+    version = "%d.%d" % sys.version_info[:2]
+    baseline = stored.get("scripts", {})
+    if stored and stored.get("python") != version and not args.update:
+        print(f"[WARN] baseline was recorded with Python {stored.get('python')}, "
+              f"running {version}: timings are not comparable")
+
+    results = {}
+    print(f"{'Script':<20} {'Import':>9} {'Baseline':>9} {'Modules':>8}")
+    for name in args.scripts or SCRIPTS:
+        try:
+            results[name] = measure(command(*SCRIPTS[name]), bare)
+        except RuntimeError as e:
+            print(f"[ERROR] {name}: {e}")
+            sys.exit(1)
+        ms, modules, rows = results[name]
+        base = baseline.get(name, {}).get("ms")
+        print(f"{name:<20} {ms:>7.1f}ms {f'{base:.1f}ms' if base is not None else '-':>9} {len(modules):>8}")
+        if args.verbose:
+            for module, self_us, _ in sorted(rows, key=lambda r: -r[1])[:8]:
+                print(f"{'':<22}{self_us / 1000:>6.1f}ms  {module}")
+
+    if args.update:
+        baseline.update({name: {"ms": round(ms, 1), "modules": modules}
+                         for name, (ms, modules, _) in results.items()})
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({"python": version, "scripts": baseline}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {BASELINE}")
+        return
+    if stored.get("python") != version:
+        baseline = {name: dict(base, ms=float("inf")) for name, base in baseline.items()}
+    failures = check(results, baseline, args.tolerance, args.slack, args.strict_time)
+    if failures:
+        print("\n[FAIL] startup regressed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n[OK] no startup regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+OpenClaw State Index - 跨工作区的项目状态索引
+
+A local SQLite database that mirrors the stage state of every project:
+state_store.StateStore records a row on each write of .openclaw/state.json
+or .openclaw-app/state.json, so fleet-wide questions become one indexed
+query instead of a crawl over every workspace.
+
+    python state_index.py list --stage prd --module web --tech nextjs
+    python state_index.py list --module database=postgresql --json
+    python state_index.py stats
+    python state_index.py timings             # time spent per stage
+    python state_index.py reindex ~/work       # backfill / drop stale rows
+
+The database lives at $OPENCLAW_STATE_INDEX, or state-index.sqlite3 in the
+validate.py cache directory. Set OPENCLAW_STATE_INDEX=off to disable it.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+INDEX_ENV = "OPENCLAW_STATE_INDEX"
+INDEX_FILE = "state-index.sqlite3"
+INDEX_VERSION = 2
+STATE_DIRS = (".openclaw", ".openclaw-app")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    root        TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    name        TEXT,
+    stage       TEXT,
+    type        TEXT,
+    tech        TEXT,
+    revision    INTEGER,
+    updated_at  TEXT,
+    indexed_at  REAL NOT NULL,
+    PRIMARY KEY (root, kind)
+);
+CREATE TABLE IF NOT EXISTS project_modules (
+    root    TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    module  TEXT NOT NULL,
+    value   TEXT NOT NULL,
+    PRIMARY KEY (root, kind, module),
+    FOREIGN KEY (root, kind) REFERENCES projects (root, kind) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS stage_times (
+    root          TEXT NOT NULL,
+    kind          TEXT NOT NULL,
+    stage         TEXT NOT NULL,
+    seconds       REAL,
+    completed_at  TEXT,
+    PRIMARY KEY (root, kind, stage),
+    FOREIGN KEY (root, kind) REFERENCES projects (root, kind) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS projects_stage ON projects (stage, tech);
+CREATE INDEX IF NOT EXISTS projects_tech ON projects (tech);
+CREATE INDEX IF NOT EXISTS projects_type ON projects (type);
+CREATE INDEX IF NOT EXISTS modules_module ON project_modules (module, value);
+CREATE INDEX IF NOT EXISTS stage_times_stage ON stage_times (stage, seconds);
+"""
+
+
+def index_path():
+    """Path of the index database, or None when disabled."""
+    env = os.environ.get(INDEX_ENV)
+    if env is not None and env.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    if env:
+        return Path(env)
+    from validate import cache_dir
+    return cache_dir() / INDEX_FILE
+
+
+def connect(path=None):
+    import sqlite3
+
+    path = Path(path or index_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(path), timeout=10)
+    db.execute("PRAGMA foreign_keys = ON")
+    if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        db.execute("PRAGMA journal_mode = WAL")
+        db.executescript(SCHEMA)
+        db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    return db
+
+
+def summarize(kind, state):
+    """Flatten a state dict into (columns, {module: value})."""
+    if kind == ".openclaw-app":
+        config = state.get("config", {})
+        ptype = state.get("projectType")
+        modules = {"oauth": config.get("use_oauth"), "database": config.get("use_database")}
+        modules[ptype] = True
+        tech = "nextjs" if ptype == "web" else None
+        name = config.get("project_name")
+    else:
+        modules = dict(state.get("modules", {}))
+        tech = state.get("prd", {}).get("tech_stack") or ("nextjs" if modules.get("web") else None)
+        ptype = None
+        name = state.get("project", {}).get("name")
+    columns = {
+        "name": name,
+        "stage": state.get("stage"),
+        "type": ptype,
+        "tech": tech,
+        "revision": state.get("revision"),
+        "updated_at": state.get("updatedAt"),
+    }
+    enabled = {k: "1" if v is True else str(v)
+               for k, v in modules.items() if k and v and v != "none"}
+    return columns, enabled
+
+
+def record(db, root, kind, state):
+    columns, modules = summarize(kind, state)
+    root = str(Path(root).resolve())
+    with db:
+        db.execute(
+            "INSERT OR REPLACE INTO projects (root, kind, name, stage, type, tech, revision,"
+            " updated_at, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (root, kind, columns["name"], columns["stage"], columns["type"], columns["tech"],
+             columns["revision"], columns["updated_at"], time.time()))
+        db.execute("DELETE FROM project_modules WHERE root = ? AND kind = ?", (root, kind))
+        db.executemany("INSERT INTO project_modules VALUES (?, ?, ?, ?)",
+                       [(root, kind, m, v) for m, v in sorted(modules.items())])
+        db.execute("DELETE FROM stage_times WHERE root = ? AND kind = ?", (root, kind))
+        db.executemany("INSERT INTO stage_times VALUES (?, ?, ?, ?, ?)",
+                       [(root, kind, stage, t.get("seconds"), t.get("completedAt"))
+                        for stage, t in sorted(state.get("stageTimes", {}).items())])
+
+
+def record_state(root, kind, state):
+    """Hook for StateStore: index one write. Returns False when disabled."""
+    if index_path() is None:
+        return False
+    db = connect()
+    try:
+        record(db, root, kind, state)
+    finally:
+        db.close()
+    return True
+
+
+def query(db, stage=None, module=None, tech=None, ptype=None, name=None):
+    sql = ["SELECT p.root, p.kind, p.name, p.stage, p.type, p.tech, p.revision, p.updated_at,"
+           " (SELECT group_concat(CASE WHEN m.value = '1' THEN m.module"
+           "  ELSE m.module || '=' || m.value END, ',')"
+           "  FROM project_modules m WHERE m.root = p.root AND m.kind = p.kind)"
+           " FROM projects p WHERE 1 = 1"]
+    args = []
+    for column, value in (("stage", stage), ("tech", tech), ("type", ptype)):
+        if value:
+            sql.append(f" AND p.{column} = ?")
+            args.append(value)
+    if name:
+        sql.append(" AND p.name LIKE ?")
+        args.append(name.replace("*", "%"))
+    for spec in module or ():
+        mod, _, value = spec.partition("=")
+        sql.append(" AND EXISTS (SELECT 1 FROM project_modules m WHERE m.root = p.root"
+                   " AND m.kind = p.kind AND m.module = ?" + (" AND m.value = ?" if value else "") + ")")
+        args += [mod, value] if value else [mod]
+    sql.append(" ORDER BY p.stage, p.name, p.root")
+    keys = ("root", "kind", "name", "stage", "type", "tech", "revision", "updated_at", "modules")
+    return [dict(zip(keys, row)) for row in db.execute("".join(sql), args)]
+
+
+def find_states(root):
+    """Yield (project root, state dir name) for every state file under ``root``."""
+    from validate import SKIP_DIRS
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        for kind in STATE_DIRS:
+            if kind in dirnames and os.path.isfile(os.path.join(dirpath, kind, "state.json")):
+                yield Path(dirpath), kind
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+
+
+def reindex(db, roots):
+    """Index every state file under ``roots`` and drop rows whose file is gone."""
+    from state_store import StateError, StateStore
+
+    indexed = failed = removed = 0
+    for root in roots:
+        root = Path(root).resolve()
+        for project, kind in find_states(root):
+            try:
+                state = StateStore(project, kind).load()
+            except StateError as e:
+                print(f"[WARN] {e}", file=sys.stderr)
+                failed += 1
+                continue
+            if state is not None:
+                record(db, project, kind, state)
+                indexed += 1
+        prefix = str(root).rstrip(os.sep) + os.sep
+        stale = [(r, k) for r, k in db.execute("SELECT root, kind FROM projects")
+                 if (r == str(root) or r.startswith(prefix))
+                 and not (Path(r) / k / "state.json").is_file()]
+        with db:
+            db.executemany("DELETE FROM projects WHERE root = ? AND kind = ?", stale)
+        removed += len(stale)
+    return indexed, failed, removed
+
+
+def stage_timings(db):
+    """{stage: (count, mean, median, p90)} over every indexed project."""
+    values = {}
+    for stage, seconds in db.execute("SELECT stage, seconds FROM stage_times"
+                                     " WHERE seconds IS NOT NULL ORDER BY stage, seconds"):
+        values.setdefault(stage, []).append(seconds)
+    return {stage: (len(v), sum(v) / len(v), v[len(v) // 2], v[min(len(v) - 1, int(len(v) * 0.9))])
+            for stage, v in values.items()}
+
+
+def print_rows(rows):
+    if not rows:
+        print("No matching projects")
+        return
+    print(f"{'Stage':<10} {'Tech':<11} {'Name':<24} {'Modules':<28} Root")
+    for r in rows:
+        print(f"{r['stage'] or '-':<10} {r['tech'] or '-':<11} {r['name'] or '-':<24} "
+              f"{r['modules'] or '-':<28} {r['root']}")
+    print(f"\n{len(rows)} project(s)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the OpenClaw project state index")
+    parser.add_argument("--db", help=f"index database (default: ${INDEX_ENV} or cache dir)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ls = sub.add_parser("list", help="list indexed projects")
+    ls.add_argument("--stage")
+    ls.add_argument("--tech")
+    ls.add_argument("--type", dest="ptype", help="init_app project type (skill/plugin/web)")
+    ls.add_argument("--module", action="append", metavar="NAME[=VALUE]",
+                    help="require an enabled module; repeatable")
+    ls.add_argument("--name", help="name pattern, * as wildcard")
+    ls.add_argument("--json", action="store_true")
+    sub.add_parser("stats", help="project counts per stage and tech")
+    sub.add_parser("timings", help="time spent per stage across projects")
+    ri = sub.add_parser("reindex", help="scan directories for state files")
+    ri.add_argument("roots", nargs="+")
+    args = parser.parse_args()
+
+    if not args.db and index_path() is None:
+        print(f"[ERROR] state index disabled by ${INDEX_ENV}")
+        sys.exit(1)
+    db = connect(args.db)
+    if args.command == "list":
+        rows = query(db, args.stage, args.module, args.tech, args.ptype, args.name)
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+        else:
+            print_rows(rows)
+    elif args.command == "stats":
+        rows = db.execute("SELECT stage, coalesce(tech, '-'), count(*) FROM projects"
+                          " GROUP BY stage, tech ORDER BY stage, tech").fetchall()
+        for stage, tech, count in rows:
+            print(f"{stage or '-':<10} {tech:<11} {count:>6}")
+        print(f"{'total':<22} {sum(r[2] for r in rows):>6}")
+    elif args.command == "timings":
+        from stages import ORDER
+        timings = stage_timings(db)
+        print(f"{'Stage':<10} {'Count':>6} {'Mean':>10} {'Median':>10} {'P90':>10}")
+        for stage in sorted(timings, key=lambda s: ORDER.get(s, len(ORDER))):
+            count, mean, median, p90 = timings[stage]
+            print(f"{stage:<10} {count:>6} {mean:>9.2f}s {median:>9.2f}s {p90:>9.2f}s")
+    else:
+        start = time.perf_counter()
+        indexed, failed, stale = reindex(db, args.roots)
+        print(f"Indexed {indexed} project(s), removed {stale} stale, {failed} unreadable "
+              f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+OpenClaw State Store - .openclaw/state.json 的加锁、原子读写
+
+Shared by init.py, define_prd.py, generate_nextjs.py and init_app.py so
+several agents driving the stages in one workspace never clobber or tear
+the state file:
+
+- every read/write holds an flock on .openclaw/state.lock (shared for
+  reads, exclusive for writes); transaction()/update() hold it across the
+  whole read-modify-write, so concurrent stages merge instead of
+  overwriting each other
+- writes go to a temp file (mode 0600, the state holds the gateway token),
+  are fsynced and renamed over state.json
+- each write is first appended to a bounded write-ahead log (state.wal,
+  JSON lines, the last WAL_MAX_ENTRIES revisions); a state.json that fails
+  to parse is recovered from the newest log entry
+- states carry schemaVersion/revision/updatedAt; older files are migrated
+  on load and files from a newer schema are refused
+- each write is also recorded in the optional cross-workspace SQLite
+  index (state_index.py, when it is importable); index failures only warn
+
+A state that cannot be read or recovered raises StateError instead of
+looking like a missing one.
+"""
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from stages import isoformat
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking, writes are still atomic
+    fcntl = None
+
+STATE_DIR = ".openclaw"
+STATE_FILE = "state.json"
+LOCK_FILE = "state.lock"
+WAL_FILE = "state.wal"
+WAL_MAX_ENTRIES = 32
+SCHEMA_VERSION = 1
+
+
+class StateError(Exception):
+    pass
+
+
+class StateVersionError(StateError):
+    """The state was written by a newer schema; never recovered over."""
+
+
+def _migrate_unversioned(state):
+    state.setdefault("revision", 0)
+    return state
+
+
+# schemaVersion -> function upgrading a state to schemaVersion + 1
+MIGRATIONS = {0: _migrate_unversioned}
+
+
+class StateStore:
+    """Locked, crash-safe access to ``<root>/<state_dir>/state.json``."""
+
+    def __init__(self, root, state_dir=STATE_DIR):
+        self.dir = Path(root) / state_dir
+        self.path = self.dir / STATE_FILE
+        self.lock_path = self.dir / LOCK_FILE
+        self.wal_path = self.dir / WAL_FILE
+
+    def exists(self):
+        return self.path.exists()
+
+    @contextmanager
+    def lock(self, exclusive=True):
+        """Hold the flock on state.lock; never creates directories for it.
+
+        Without a state directory there is no state to protect, so nothing
+        is locked; writers create the directory before locking.
+        """
+        if fcntl is None or not self.dir.is_dir():
+            yield
+            return
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def load(self):
+        """Return the state dict, or None if the project is not initialized."""
+        if not self.path.exists():
+            return None
+        with self.lock(exclusive=False):
+            try:
+                return self._read()
+            except StateError:
+                pass
+        with self.lock():
+            try:
+                return self._read()
+            except StateError as e:
+                return self._recover(e)
+
+    def save(self, state):
+        """Replace the whole state. Returns the stamped copy that was written."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self.lock():
+            current = self._read_or_recover()
+            return self._write(state, current.get("revision", 0) if current else 0)
+
+    @contextmanager
+    def transaction(self, default=None):
+        """Yield the current state for in-place edits and write it back on exit.
+
+        The exclusive lock is held throughout. Raises StateError when no state
+        exists and no ``default`` is given.
+        """
+        if default is None and not self.path.exists():
+            raise StateError(f"{self.path} 不存在，请先运行 /openclaw-init")
+        if default is not None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+        with self.lock():
+            state = self._read_or_recover()
+            if state is None:
+                if default is None:
+                    raise StateError(f"{self.path} 不存在，请先运行 /openclaw-init")
+                state = json.loads(json.dumps(default))
+            revision = state.get("revision", 0)
+            yield state
+            self._write(state, revision)
+
+    def update(self, **fields):
+        """Merge top-level ``fields`` into the stored state atomically."""
+        with self.transaction() as state:
+            state.update(fields)
+        return state
+
+    def reset(self):
+        """Drop the state and its log (keeps the lock file)."""
+        with self.lock():
+            for path in (self.path, self.wal_path):
+                if path.exists():
+                    path.unlink()
+
+    def history(self):
+        """Logged revisions, oldest first."""
+        entries = []
+        if self.wal_path.exists():
+            for line in self.wal_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # torn tail from a crash mid-append
+        return entries
+
+    def _read(self):
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise StateError(f"{self.path} 无法解析: {e}")
+        if not isinstance(state, dict):
+            raise StateError(f"{self.path} 不是 JSON 对象")
+        return self._migrate(state)
+
+    def _read_or_recover(self):
+        try:
+            return self._read()
+        except StateError as e:
+            return self._recover(e)
+
+    def _recover(self, error):
+        entries = [e for e in self.history() if isinstance(e.get("state"), dict)]
+        if not entries or isinstance(error, StateVersionError):
+            raise error
+        state = self._migrate(entries[-1]["state"])
+        self._replace(state)
+        print(f"⚠️  {error}；已从 {self.wal_path.name} 恢复 revision {state.get('revision')}",
+              file=sys.stderr)
+        return state
+
+    def _migrate(self, state):
+        version = state.get("schemaVersion", 0)
+        if version > SCHEMA_VERSION:
+            raise StateVersionError(f"{self.path} 的 schemaVersion {version} 高于当前支持的 "
+                                    f"{SCHEMA_VERSION}，请升级 openclaw-skills")
+        while version < SCHEMA_VERSION:
+            state = MIGRATIONS[version](state)
+            version += 1
+        state["schemaVersion"] = SCHEMA_VERSION
+        return state
+
+    def _write(self, state, revision):
+        state["schemaVersion"] = SCHEMA_VERSION
+        state["revision"] = revision + 1
+        state["updatedAt"] = isoformat()
+        self._log(state)
+        self._replace(state)
+        self._index(state)
+        return state
+
+    def _index(self, state):
+        try:
+            from state_index import record_state
+        except ImportError:  # a stage skill installed on its own ships without the index
+            return
+        try:
+            record_state(self.dir.parent, self.dir.name, state)
+        except Exception as e:  # the index is a cache; never fail a save over it
+            print(f"⚠️  状态索引未更新: {e}", file=sys.stderr)
+
+    def _log(self, state):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        entry = {"revision": state["revision"], "at": state["updatedAt"], "state": state}
+        # entries carry the full state (gateway_token included): private like state.json
+        fd = os.open(self.wal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)  # a WAL written before this was 0644
+        with os.fdopen(fd, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if state["revision"] % WAL_MAX_ENTRIES == 0:
+            keep = self.history()[-WAL_MAX_ENTRIES:]
+            self._atomic_write(self.wal_path, "".join(
+                json.dumps(e, ensure_ascii=False) + "\n" for e in keep))
+
+    def _replace(self, state):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(self.path, json.dumps(state, indent=2, ensure_ascii=False))
+
+    def _atomic_write(self, path, text):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+        if hasattr(os, "O_DIRECTORY"):
+            dfd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dfd)
+            finally:
+                os.close(dfd)
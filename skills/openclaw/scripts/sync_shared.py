@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Shared Modules - 将共享模块同步到各技能的 scripts/
+
+Each skill is released as its own .skill archive and may be copied into a
+workspace on its own, so a skill's scripts cannot import from a sibling
+skill's folder. The modules several skills need live here in
+skills/openclaw/scripts/ and are copied verbatim (plus a marker line) into
+the scripts/ of every skill listed in SHARED:
+
+    python sync_shared.py            # refresh the copies
+    python sync_shared.py --check    # exit 1 if any copy is stale (CI)
+
+Edit the originals here, never the copies.
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILLS_DIR = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
+
+# skill -> modules from this directory its scripts import
+SHARED = {
+    "openclaw-init": ["stages.py", "state_store.py"],
+    "openclaw-prd": ["stages.py", "state_store.py"],
+    "openclaw-nextjs": ["project_writer.py", "stages.py", "state_store.py"],
+}
+
+MARKER = "# Copied from skills/openclaw/scripts/{name} by sync_shared.py; edit the original.\n"
+
+
+def vendored(name):
+    """The content of the copy of ``name``: the original with the marker after the shebang."""
+    with open(os.path.join(SCRIPTS_DIR, name), encoding="utf-8") as f:
+        lines = f.readlines()
+    at = 1 if lines and lines[0].startswith("#!") else 0
+    return "".join(lines[:at] + [MARKER.format(name=name)] + lines[at:])
+
+
+def stale():
+    """[(copy path, expected content)] for every missing or outdated copy."""
+    out = []
+    for skill, names in SHARED.items():
+        for name in names:
+            path = os.path.join(SKILLS_DIR, skill, "scripts", name)
+            expected = vendored(name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    if f.read() == expected:
+                        continue
+            except OSError:
+                pass
+            out.append((path, expected))
+    return out
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Copy shared modules into the skills that use them")
+    parser.add_argument("--check", action="store_true", help="only report stale copies, exit 1 if any")
+    args = parser.parse_args()
+
+    outdated = stale()
+    for path, expected in outdated:
+        rel = os.path.relpath(path, SKILLS_DIR)
+        if args.check:
+            print(f"[STALE] {rel}")
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(expected)
+        print(f"[SYNC] {rel}")
+    if args.check and outdated:
+        print("Run skills/openclaw/scripts/sync_shared.py to refresh them.")
+        sys.exit(1)
+    if not outdated:
+        print("[OK] shared modules up to date")
+
+
+if __name__ == "__main__":
+    main()
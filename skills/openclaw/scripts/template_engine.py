@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+OpenClaw Template Engine - 项目模板加载与渲染
+
+Project files live under skills/openclaw/templates/<type>/ as ``*.tmpl``
+files mirroring the generated layout (``app/page.tsx.tmpl`` renders to
+``app/page.tsx``). Each template is read and compiled to a Python render
+function once per process; rendering is a single ``"".join`` over
+literals and filtered context values.
+
+Syntax: ``{{ name }}`` or ``{{ name|filter|filter }}`` where ``name`` is a
+plain identifier. Anything else in braces - JSX ``style={{ padding: 0 }}``,
+JS ``${token}`` - is literal text, so templates need no brace doubling.
+Values are inserted raw unless a filter escapes them for their context:
+
+  json     JSON literal (strings quoted)    js       body of a JS/JSON string
+  html     HTML-escaped text                jsx      JSX text (html + braces)
+  oneline  whitespace collapsed to spaces
+"""
+
+import json
+import re
+from pathlib import Path
+
+TEMPLATE_ROOT = Path(__file__).resolve().parent.parent / "templates"
+TEMPLATE_SUFFIX = ".tmpl"
+TAG = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)((?:\s*\|\s*[a-z]+)*)\s*\}\}")
+
+
+class TemplateError(Exception):
+    pass
+
+
+def _js(value):
+    return json.dumps(str(value), ensure_ascii=False)[1:-1].replace("</", "<\\/")
+
+
+def _html(value):
+    import html
+    return html.escape(str(value))
+
+
+def _jsx(value):
+    return _html(value).replace("{", "&#123;").replace("}", "&#125;")
+
+
+FILTERS = {
+    "json": lambda v: json.dumps(v, ensure_ascii=False),
+    "js": _js,
+    "html": _html,
+    "jsx": _jsx,
+    "oneline": lambda v: " ".join(str(v).split()),
+}
+
+
+class Template:
+    """A compiled template: ``render(context)`` returns the output text."""
+
+    def __init__(self, source, name="<string>"):
+        self.name = name
+        self.variables = set()
+        self._render = self._compile(source)
+
+    def _compile(self, source):
+        parts, pos = [], 0
+        for m in TAG.finditer(source):
+            if m.start() > pos:
+                parts.append(repr(source[pos:m.start()]))
+            var = m.group(1)
+            expr = f"ctx[{var!r}]"
+            for flt in m.group(2).replace(" ", "").split("|")[1:]:
+                if flt not in FILTERS:
+                    line = source.count("\n", 0, m.start()) + 1
+                    raise TemplateError(f"{self.name}:{line}: unknown filter '{flt}'")
+                expr = f"_f[{flt!r}]({expr})"
+            if not m.group(2):
+                expr = f"str({expr})"
+            parts.append(expr)
+            self.variables.add(var)
+            pos = m.end()
+        if pos < len(source):
+            parts.append(repr(source[pos:]))
+        code = "def render(ctx):\n    return ''.join((%s,))\n" % ", ".join(parts or ["''"])
+        namespace = {"_f": FILTERS}
+        exec(compile(code, self.name, "exec"), namespace)
+        return namespace["render"]
+
+    def render(self, context):
+        try:
+            return self._render(context)
+        except KeyError as e:
+            raise TemplateError(f"{self.name}: undefined variable {e}") from None
+
+
+_cache = {}
+
+
+def load_template(path):
+    """Compile ``path`` on first use and return the cached Template."""
+    path = str(path)
+    tmpl = _cache.get(path)
+    if tmpl is None:
+        tmpl = _cache[path] = Template(Path(path).read_text(encoding="utf-8"), path)
+    return tmpl
+
+
+def project_templates(kind, root=TEMPLATE_ROOT):
+    """Return {output relpath: Template} for every template of a project type."""
+    key = (str(root), kind)
+    found = _cache.get(key)
+    if found is None:
+        base = Path(root) / kind
+        if not base.is_dir():
+            raise TemplateError(f"no templates for '{kind}' in {root}")
+        found = _cache[key] = {
+            p.relative_to(base).as_posix()[:-len(TEMPLATE_SUFFIX)]: load_template(p)
+            for p in sorted(base.rglob("*" + TEMPLATE_SUFFIX))
+        }
+    return found
+
+
+def render_project(kind, context, skip=()):
+    """Render all templates of ``kind`` into {relpath: text}, except ``skip``."""
+    return {rel: tmpl.render(context)
+            for rel, tmpl in project_templates(kind).items() if rel not in skip}
@@ -1,104 +1,770 @@
 #!/usr/bin/env python3
 """
 OpenClaw Skill Validation - 验证生成的 skill 项目
+
+With -r/--recursive, every skill, plugin and web project under a root is
+validated concurrently on a thread pool; --json prints machine-readable
+results instead of the human report.
+
+SKILL.md frontmatter is parsed line by line up to the closing ``---`` and
+checked against FRONTMATTER_SCHEMA. Results are cached on disk (see
+``cache_dir``) keyed by path and validated by mtime and size, so an
+unchanged SKILL.md costs a single stat on later runs.
+
+--watch keeps running and re-validates only the projects whose files
+change, using inotify on Linux and stat polling elsewhere (or with --poll).
+
+Plugins are checked beyond package.json: every openclaw.extensions entry
+must resolve to a built file or its TypeScript source, and the import
+graph from index.ts is walked to find unresolved modules, undeclared
+packages and source files nothing imports. Per-file import scans are
+cached alongside the file's content hash.
 """
 
+import json
+import os
+import re
 import sys
+import threading
+import time
 from pathlib import Path
 
-def validate_skill(path):
+# Never descended into when searching for projects.
+SKIP_DIRS = {".git", ".openclaw", ".openclaw-app", "node_modules", "__pycache__",
+             ".next", "dist", ".venv"}
+
+FRONTMATTER_MAX_LINES = 200
+FRONTMATTER_SCHEMA = {
+    "name": {"type": str, "required": True, "max": 64,
+             "pattern": re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")},
+    "description": {"type": str, "required": True, "max": 1024},
+    "user-invocable": {"type": bool},
+    "argument-hint": {"type": str},
+}
+# inotify(7) event bits.
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+# Editors save in bursts of events; wait this long for the burst to finish.
+WATCH_DEBOUNCE = 0.03
+# A change to one of these may add or remove a project.
+PROJECT_MARKERS = {"SKILL.md", "index.ts", "package.json", "page.tsx"}
+
+# Bump whenever the parser or schema changes so stale cache entries are dropped.
+FRONTMATTER_CACHE_VERSION = 2
+IMPORT_CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 20000
+
+SCRIPT_SUFFIXES = (".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs")
+RESOLVE_SUFFIXES = (".ts", ".tsx", ".mts", ".cts", ".d.ts", ".js", ".jsx", ".mjs", ".cjs", ".json")
+# Strings are kept (import specifiers live in them); comments are dropped.
+COMMENT_OR_STRING = re.compile(
+    r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|//[^\n]*|/\*.*?\*/""",
+    re.S)
+IMPORT_SPECIFIER = re.compile(
+    r"""\bfrom\s*['"]([^'"\n]+)['"]"""
+    r"""|\bimport\s*['"]([^'"\n]+)['"]"""
+    r"""|\b(?:import|require)\s*\(\s*['"]([^'"\n]+)['"]\s*\)""")
+NODE_BUILTINS = {
+    "assert", "buffer", "child_process", "crypto", "dns", "events", "fs", "http",
+    "https", "net", "os", "path", "process", "querystring", "readline", "stream",
+    "string_decoder", "timers", "tls", "url", "util", "worker_threads", "zlib",
+}
+
+
+class FrontmatterError(ValueError):
+    pass
+
+
+def cache_dir():
+    return Path(os.environ.get("OPENCLAW_CACHE_DIR")
+                or Path.home() / ".cache" / "openclaw-skills")
+
+
+class StatCache:
+    """Results persisted in a JSON file, keyed by path and valid while the
+    file's (mtime_ns, size) is unchanged. Safe to share between threads;
+    concurrent processes merge on save and never leave a partial file."""
+
+    def __init__(self, name, version):
+        self.path = cache_dir() / f"{name}.json"
+        self.version = version
+        self.entries = None
+        self.dirty = {}
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data.get("entries", {}) if data.get("version") == self.version else {}
+
+    def get(self, path, st):
+        with self.lock:
+            if self.entries is None:
+                self.entries = self._load()
+            hit = self.entries.get(str(path))
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        return None
+
+    def peek(self, path):
+        """Last stored value for ``path`` whether or not it is still fresh."""
+        with self.lock:
+            if self.entries is None:
+                self.entries = self._load()
+            hit = self.entries.get(str(path))
+        return hit[2] if hit else None
+
+    def put(self, path, st, value):
+        entry = [st.st_mtime_ns, st.st_size, value]
+        with self.lock:
+            if self.entries is None:
+                self.entries = self._load()
+            self.entries[str(path)] = entry
+            self.dirty[str(path)] = entry
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = self._load()
+            entries.update(self.dirty)
+            if len(entries) > CACHE_MAX_ENTRIES:
+                entries = dict(list(entries.items())[-CACHE_MAX_ENTRIES:])
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps({"version": self.version, "entries": entries}))
+                os.replace(tmp, self.path)
+            except OSError:
+                pass  # caching is best effort
+            self.dirty = {}
+
+
+frontmatter_cache = StatCache("frontmatter", FRONTMATTER_CACHE_VERSION)
+import_cache = StatCache("imports", IMPORT_CACHE_VERSION)
+
+
+def save_caches():
+    frontmatter_cache.save()
+    import_cache.save()
+
+
+def parse_scalar(raw):
+    value = raw.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        if value[0] == "'":
+            return value[1:-1].replace("''", "'")
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if " #" in value:
+        value = value[:value.index(" #")].rstrip()
+    lowered = value.lower()
+    if lowered in ("true", "yes"):
+        return True
+    if lowered in ("false", "no"):
+        return False
+    return value
+
+
+def parse_frontmatter(path, max_lines=FRONTMATTER_MAX_LINES):
+    """Parse the flat YAML frontmatter at the top of ``path``.
+
+    Reading stops at the closing ``---``, so the body is never loaded.
+    Supports ``key: value`` scalars (plain, quoted, booleans), indented
+    continuation lines, ``|``/``>`` block scalars and block sequences
+    (``- item`` lines under an empty key, parsed into a list).
+    """
+    fields = {}
+    key = block = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        if f.readline().lstrip("\ufeff").rstrip() != "---":
+            raise FrontmatterError("Missing YAML frontmatter")
+        for lineno, line in enumerate(f, 2):
+            if lineno > max_lines:
+                raise FrontmatterError(f"Frontmatter not closed within {max_lines} lines")
+            text = line.rstrip("\r\n")
+            if text.rstrip() == "---":
+                return fields
+            if not text.strip() or text.lstrip().startswith("#"):
+                if block == "|" and fields.get(key):
+                    fields[key] += "\n"
+                continue
+            item = text.strip()
+            if (item == "-" or item.startswith("- ")) and key is not None and block is None \
+                    and (fields[key] == "" or isinstance(fields[key], list)):
+                if fields[key] == "":
+                    fields[key] = []
+                fields[key].append(parse_scalar(item[1:]))
+                continue
+            if text[0] in " \t" and key is not None and isinstance(fields[key], list):
+                fields[key][-1] = f"{fields[key][-1]} {item}".strip()  # continues the last item
+                continue
+            if text[0] in " \t":
+                if key is None or not isinstance(fields[key], str):
+                    raise FrontmatterError(f"Frontmatter line {lineno}: unexpected indentation")
+                sep = ("\n" if block == "|" else " ") if fields[key] else ""
+                fields[key] += sep + text.strip()
+                continue
+            name, colon, value = text.partition(":")
+            if not colon or not name.strip():
+                raise FrontmatterError(f"Frontmatter line {lineno}: expected 'key: value'")
+            key = name.strip()
+            if key in fields:
+                raise FrontmatterError(f"Frontmatter line {lineno}: duplicate key {key!r}")
+            value = value.strip()
+            block = value[0] if value[:1] in ("|", ">") else None
+            fields[key] = "" if block else parse_scalar(value)
+    raise FrontmatterError("Frontmatter is not closed with '---'")
+
+
+def check_schema(fields):
+    """Return an error message for the first schema violation, or None."""
+    for key, rule in FRONTMATTER_SCHEMA.items():
+        value = fields.get(key)
+        if value is None or value == "":
+            if rule.get("required"):
+                return f"Missing {key} in frontmatter"
+            continue
+        if not isinstance(value, rule["type"]):
+            kind = "true/false" if rule["type"] is bool else "a string"
+            return f"Frontmatter {key} must be {kind}"
+        if "max" in rule and len(value) > rule["max"]:
+            return f"Frontmatter {key} is longer than {rule['max']} characters"
+        if "pattern" in rule and not rule["pattern"].match(value):
+            return f"Frontmatter {key} must be kebab-case: {value!r}"
+    return None
+
+
+def check_frontmatter(path, use_cache=True):
+    """Parse and schema-check a SKILL.md. Returns (ok, message, fields)."""
+    path = Path(path).resolve()
+    st = path.stat()
+    if use_cache:
+        hit = frontmatter_cache.get(path, st)
+        if hit is not None:
+            return tuple(hit)
+    try:
+        fields = parse_frontmatter(path)
+        error = check_schema(fields)
+    except FrontmatterError as e:
+        fields, error = {}, str(e)
+    result = (error is None, error or "Frontmatter valid", fields)
+    if use_cache:
+        frontmatter_cache.put(path, st, list(result))
+    return result
+
+
+def validate_skill(path, log=print):
     p = Path(path)
-    
+
     if not (p / "SKILL.md").exists():
         return False, "SKILL.md not found"
-    
-    content = (p / "SKILL.md").read_text()
-    if not content.startswith("---"):
-        return False, "Missing YAML frontmatter"
-    
-    if "name:" not in content[:1000] or "description:" not in content[:1000]:
-        return False, "Missing name or description in frontmatter"
-    
+
+    ok, msg, _ = check_frontmatter(p / "SKILL.md")
+    if not ok:
+        return False, msg
+
     for dirname in ["scripts", "references", "assets"]:
         dir_path = p / dirname
         if dir_path.exists():
-            print(f"  [OK] {dirname}/ directory exists")
+            log(f"  [OK] {dirname}/ directory exists")
             if any(dir_path.iterdir()):
-                print(f"      {dirname}/ contains files")
+                log(f"      {dirname}/ contains files")
             else:
-                print(f"      {dirname}/ is empty (OK)")
-    
+                log(f"      {dirname}/ is empty (OK)")
+
     return True, "Skill project looks good!"
 
 
-def validate_plugin(path):
+def scan_imports(path):
+    """Return (specifiers, size, gzip size) for one module, cached by content hash.
+
+    An unchanged stat skips reading the file; a changed stat with the same
+    content hash skips the regex scan.
+    """
+    st = path.stat()
+    hit = import_cache.get(path, st)
+    if hit is not None:
+        return hit[1], hit[2], hit[3]
+    import hashlib
+    import zlib
+    data = path.read_bytes()
+    digest = hashlib.sha1(data).hexdigest()
+    old = import_cache.peek(path)
+    if old and old[0] == digest:
+        specs, gzip_size = old[1], old[3]
+    else:
+        gzip_size = len(zlib.compress(data, 6))
+        specs = []
+        if path.suffix in SCRIPT_SUFFIXES:
+            text = COMMENT_OR_STRING.sub(
+                lambda m: m.group(1) or " ", data.decode("utf-8", errors="replace"))
+            specs = sorted({next(g for g in m.groups() if g)
+                            for m in IMPORT_SPECIFIER.finditer(text)})
+    import_cache.put(path, st, [digest, specs, len(data), gzip_size])
+    return specs, len(data), gzip_size
+
+
+def resolve_module(base_dir, spec):
+    """Resolve a relative import the way TypeScript's bundler resolution does."""
+    base = base_dir / spec
+    candidates = [base]
+    stem = re.sub(r"\.[mc]?jsx?$", "", base.name)
+    if stem != base.name:
+        # ESM-style "./foo.js" refers to foo.ts before it is compiled.
+        candidates += [base.with_name(stem + s) for s in (".ts", ".tsx", ".mts", ".cts")]
+    candidates += [base.with_name(base.name + s) for s in RESOLVE_SUFFIXES]
+    candidates += [base / f"index{s}" for s in RESOLVE_SUFFIXES]
+    for c in candidates:
+        if c.is_file():
+            return c.resolve()
+    return None
+
+
+def package_name(spec):
+    parts = spec.split("/")
+    return "/".join(parts[:2]) if spec.startswith("@") else parts[0]
+
+
+def walk_imports(entries):
+    """Follow relative imports from ``entries``. Returns (reachable, missing, external)."""
+    reachable, missing, external = set(), [], set()
+    stack = list(entries)
+    while stack:
+        module = stack.pop()
+        if module in reachable:
+            continue
+        reachable.add(module)
+        specs, _, _ = scan_imports(module)
+        for spec in specs:
+            if spec.startswith((".", "/")):
+                target = resolve_module(module.parent, spec)
+                if target is None:
+                    missing.append((module, spec))
+                elif target not in reachable:
+                    stack.append(target)
+            elif not spec.startswith("node:"):
+                external.add(package_name(spec))
+    return reachable, missing, external
+
+
+def load_tsconfig(p):
+    try:
+        text = COMMENT_OR_STRING.sub(lambda m: m.group(1) or " ", (p / "tsconfig.json").read_text())
+        options = json.loads(re.sub(r",(\s*[}\]])", r"\1", text)).get("compilerOptions", {})
+    except (OSError, ValueError, AttributeError):
+        options = {}
+    return options.get("outDir", "dist"), options.get("rootDir", ".")
+
+
+def resolve_extension(p, spec, tsconfig):
+    """Map an openclaw.extensions entry to its TypeScript source or built file."""
+    out_dir, root_dir = (os.path.normpath(d) for d in tsconfig)
+    rel = os.path.normpath(spec)
+    if rel == out_dir or rel.startswith(out_dir + os.sep):
+        source = p / root_dir / os.path.relpath(rel, out_dir)
+        found = resolve_module(source.parent, source.name)
+        if found and found.suffix in (".ts", ".tsx", ".mts", ".cts"):
+            return found, " (source)"
+    built = p / rel
+    if built.is_file():
+        return built.resolve(), ""
+    return None, ""
+
+
+def plugin_sources(p):
+    """Every TypeScript module that should end up in the plugin bundle."""
+    sources = set()
+    for dirpath, dirnames, filenames in os.walk(p):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if (name.endswith((".ts", ".tsx")) and not name.endswith(".d.ts")
+                    and not re.search(r"\.(test|spec)\.tsx?$", name)):
+                sources.add(Path(dirpath, name).resolve())
+    return sources
+
+
+def human_kb(n):
+    return f"{n / 1024:.1f}KB"
+
+
+def validate_plugin(path, log=print):
     p = Path(path)
-    
+
     required = ["index.ts", "package.json"]
     for f in required:
         if not (p / f).exists():
             return False, f"Missing required file: {f}"
-    
-    import json
+
     try:
         pkg = json.loads((p / "package.json").read_text())
     except Exception as e:
         return False, f"Invalid package.json: {e}"
-    
+
     if "openclaw" not in pkg or "extensions" not in pkg["openclaw"]:
         return False, "package.json missing openclaw.extensions"
-    
-    print("  [OK] Plugin structure valid")
-    print("  [OK] openclaw.extensions defined")
-    
+
+    extensions = pkg["openclaw"]["extensions"]
+    if not isinstance(extensions, list) or not extensions:
+        return False, "openclaw.extensions must be a non-empty list"
+
+    log("  [OK] Plugin structure valid")
+    log("  [OK] openclaw.extensions defined")
+
+    p = p.resolve()
+    tsconfig = load_tsconfig(p)
+    entries = [p / "index.ts"]
+    for spec in extensions:
+        target, note = resolve_extension(p, spec, tsconfig)
+        if target is None:
+            return False, f"openclaw.extensions entry {spec} has no built file or TypeScript source"
+        log(f"  [OK] extension {spec} -> {target.relative_to(p)}{note}")
+        if target.suffix in SCRIPT_SUFFIXES:
+            entries.append(target)
+
+    reachable, missing, external = walk_imports(entries)
+    for module, spec in missing:
+        log(f"  [ERROR] {module.relative_to(p)}: cannot resolve '{spec}'")
+
+    deps = set()
+    for key in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies"):
+        deps.update(pkg.get(key) or {})
+    for name in sorted(external - deps - NODE_BUILTINS):
+        log(f"  [WARN] '{name}' is imported but not declared in package.json")
+    for module in sorted(plugin_sources(p) - reachable):
+        log(f"  [WARN] {module.relative_to(p)} is not reachable from index.ts or openclaw.extensions")
+
+    size = gzip_size = 0
+    for module in reachable:
+        _, n, gz = scan_imports(module)
+        size += n
+        gzip_size += gz
+    log(f"  [OK] Import graph: {len(reachable)} modules, {human_kb(size)} source "
+        f"(~{human_kb(gzip_size)} gzipped), {len(external)} external packages")
+
+    if missing:
+        module, spec = missing[0]
+        return False, (f"{len(missing)} unresolved import(s), e.g. "
+                       f"'{spec}' in {module.relative_to(p)}")
     return True, "Plugin project looks good!"
 
 
-def validate_web(path):
+def validate_web(path, log=print):
     p = Path(path)
-    
+
     required = ["package.json", "app/page.tsx", "app/layout.tsx"]
     for f in required:
         if not (p / f).exists():
             return False, f"Missing required file: {f}"
-    
-    print("  [OK] Next.js structure present")
-    
+
+    log("  [OK] Next.js structure present")
+
     if (p / ".env.local.example").exists():
-        print("  [OK] .env.local.example provided")
-    
+        log("  [OK] .env.local.example provided")
+
     return True, "Web project looks good!"
 
 
+def detect_type(path):
+    """Return (project type, validator) for ``path``, or (None, None)."""
+    if (path / "SKILL.md").exists():
+        return "skill", validate_skill
+    if (path / "index.ts").exists() and (path / "package.json").exists():
+        return "plugin", validate_plugin
+    if (path / "app" / "page.tsx").exists():
+        return "web", validate_web
+    return None, None
+
+
+def find_projects(root):
+    """Yield every directory under ``root`` that looks like a project."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        names = set(filenames)
+        if ("SKILL.md" in names or {"index.ts", "package.json"} <= names
+                or ("app" in dirnames and os.path.isfile(os.path.join(dirpath, "app", "page.tsx")))):
+            yield Path(dirpath)
+
+
+def run_validator(path):
+    """Validate one project, capturing its report instead of printing it."""
+    ptype, validator = detect_type(path)
+    details = []
+    start = time.perf_counter()
+    try:
+        if validator:
+            valid, msg = validator(path, log=details.append)
+        else:
+            valid, msg = False, "Cannot determine project type"
+    except Exception as e:
+        valid, msg = False, f"Validator crashed: {e}"
+    return {
+        "path": str(path),
+        "type": ptype,
+        "valid": valid,
+        "message": msg,
+        "details": [d.strip() for d in details],
+        "ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def validate_tree(root, jobs=None):
+    """Validate every project under ``root`` concurrently; results keep discovery order."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    projects = list(find_projects(root))
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        results = list(pool.map(run_validator, projects))
+    save_caches()
+    return results
+
+
+def main_recursive(root, as_json, jobs):
+    start = time.perf_counter()
+    results = validate_tree(root, jobs)
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if not r["valid"]]
+    if as_json:
+        print(json.dumps({
+            "root": str(root),
+            "total": len(results),
+            "valid": len(results) - len(failed),
+            "invalid": len(failed),
+            "seconds": round(elapsed, 3),
+            "results": results,
+        }, indent=2, ensure_ascii=False))
+    else:
+        for r in results:
+            mark = "[OK]  " if r["valid"] else "[FAIL]"
+            print(f"{mark} {r['type']:<6} {r['path']}: {r['message']}")
+        print(f"\nValidated {len(results)} projects in {elapsed:.2f}s, {len(failed)} invalid")
+    sys.exit(0 if results and not failed else 1)
+
+
+def iter_dirs(root):
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        yield dirpath
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on Linux inotify, called through ctypes."""
+
+    kind = "inotify"
+
+    def __init__(self, root):
+        import ctypes
+        import ctypes.util
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for d in iter_dirs(root):
+            self.add(d)
+
+    def add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = path
+
+    def poll(self, timeout):
+        """Return changed paths, or None if events were lost and all may have changed."""
+        import select
+        import struct
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed, lost = set(), False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, size = struct.unpack_from("iIII", buf, offset)
+                name = buf[offset + 16:offset + 16 + size].rstrip(b"\0")
+                offset += 16 + size
+                if mask & IN_Q_OVERFLOW:
+                    lost = True
+                    continue
+                base = self.dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                if base is None:
+                    continue
+                path = os.path.join(base, os.fsdecode(name)) if name else base
+                changed.add(Path(path))
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    if os.path.basename(path) not in SKIP_DIRS:
+                        for d in iter_dirs(path):
+                            self.add(d)
+        return None if lost else changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: rescan (mtime_ns, size) of every watched file."""
+
+    kind = "polling"
+
+    def __init__(self, root, interval):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for d in iter_dirs(self.root):
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            st = entry.stat()
+                            snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(min(self.interval, timeout))
+        snapshot = self.scan()
+        old, self.snapshot = self.snapshot, snapshot
+        return {Path(p) for p in old.keys() | snapshot.keys() if old.get(p) != snapshot.get(p)}
+
+    def close(self):
+        pass
+
+
+def make_watcher(root, force_poll=False, interval=0.5):
+    if not force_poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval)
+
+
+def print_result(result, as_json):
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        return
+    mark = "[OK]  " if result["valid"] else "[FAIL]"
+    stamp = time.strftime("%H:%M:%S")
+    print(f"[{stamp}] {mark} {result['type'] or '-':<6} {result['path']}: "
+          f"{result['message']} ({result['ms']}ms)", flush=True)
+
+
+def watch(path, recursive=False, as_json=False, force_poll=False, interval=0.5):
+    """Validate, then re-validate projects as their files change until Ctrl-C."""
+    root = Path(path).resolve()
+
+    def discover():
+        return set(find_projects(root)) if recursive else {root}
+
+    def owner(changed):
+        for parent in (changed, *changed.parents):
+            if parent in projects:
+                return parent
+        return None
+
+    projects = discover()
+    for project in sorted(projects):
+        print_result(run_validator(project), as_json)
+    save_caches()
+
+    watcher = make_watcher(root, force_poll, interval)
+    print(f"Watching {len(projects)} project(s) under {root} via {watcher.kind}, Ctrl-C to stop",
+          file=sys.stderr)
+    try:
+        while True:
+            changed = watcher.poll(1.0)
+            if changed == set():
+                continue
+            start = time.perf_counter()
+            if changed is not None:
+                time.sleep(WATCH_DEBOUNCE)
+                more = watcher.poll(0)
+                changed = None if more is None else changed | more
+            if changed is None or any(p.name in PROJECT_MARKERS for p in changed):
+                projects = discover()
+            targets = projects if changed is None else {owner(p) for p in changed} - {None}
+            for project in sorted(targets):
+                result = run_validator(project)
+                result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+                print_result(result, as_json)
+            save_caches()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python validate.py <project-directory>")
-        sys.exit(1)
-    
-    path = Path(sys.argv[1])
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate OpenClaw skill/plugin/web projects")
+    parser.add_argument("path", help="project directory, or a root to search with -r")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="validate every project found under path")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="validator threads for -r (default: 4 x CPU count)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-validate projects as they change")
+    parser.add_argument("--poll", action="store_true",
+                        help="with --watch, poll file stats instead of using inotify")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="polling interval in seconds (default: 0.5)")
+    args = parser.parse_args()
+
+    path = Path(args.path)
     if not path.exists():
         print(f"Error: Directory not found: {path}")
         sys.exit(1)
-    
-    if (path / "SKILL.md").exists():
-        validator = validate_skill
-        ptype = "skill"
-    elif (path / "index.ts").exists() and (path / "package.json").exists():
-        validator = validate_plugin
-        ptype = "plugin"
-    elif (path / "app" / "page.tsx").exists():
-        validator = validate_web
-        ptype = "web"
-    else:
+
+    if args.watch:
+        watch(path, args.recursive, args.json, args.poll, args.interval)
+        return
+
+    if args.recursive:
+        main_recursive(path, args.json, args.jobs)
+
+    ptype, validator = detect_type(path)
+    if not validator:
         print("Error: Cannot determine project type")
         sys.exit(1)
-    
+
+    if args.json:
+        result = run_validator(path)
+        save_caches()
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        sys.exit(0 if result["valid"] else 1)
+
     print(f"Validating {ptype} project: {path}")
     valid, msg = validator(path)
+    save_caches()
     print(f"\nResult: {msg}")
-    
+
     sys.exit(0 if valid else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
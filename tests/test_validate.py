@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "skills" / "openclaw" / "scripts"))
+
+from validate import FrontmatterError, check_frontmatter, parse_frontmatter
+
+
+def write_skill(tmp_path, frontmatter):
+    path = tmp_path / "SKILL.md"
+    path.write_text(f"---\n{frontmatter}---\n\n# Body\n", encoding="utf-8")
+    return path
+
+
+def test_block_sequence(tmp_path):
+    path = write_skill(tmp_path, "name: demo\ntags:\n- a\n- b\n  continued\n  - 'c: d'\ndescription: x\n")
+    fields = parse_frontmatter(path)
+    assert fields["tags"] == ["a", "b continued", "c: d"]
+    assert fields["description"] == "x"
+
+
+def test_block_sequence_passes_check(tmp_path):
+    path = write_skill(tmp_path, "name: demo\ndescription: A demo skill\ntags:\n- a\n- b\n")
+    ok, message, _ = check_frontmatter(path, use_cache=False)
+    assert ok, message
+
+
+def test_item_without_key_is_rejected(tmp_path):
+    path = write_skill(tmp_path, "- a\nname: demo\n")
+    with pytest.raises(FrontmatterError):
+        parse_frontmatter(path)